@@ -0,0 +1,144 @@
+from collections import deque
+
+# Generalized missionaries and cannibals: N missionaries, M cannibals, boat of capacity K.
+# A state (missionaries_left, cannibals_left, boat) is packed into a single int:
+#   ((missionaries_left * (M + 1)) + cannibals_left) * 2 + boat
+# and the search only stores one parent pointer per reached state, so memory is
+# linear in the number of states instead of one path copy per queued node.
+
+def encode(missionaries, cannibals, boat, total_cannibals):
+    return (missionaries * (total_cannibals + 1) + cannibals) * 2 + boat
+
+def decode(code, total_cannibals):
+    code, boat = divmod(code, 2)
+    missionaries, cannibals = divmod(code, total_cannibals + 1)
+    return missionaries, cannibals, boat
+
+# Check if the missionaries are safe on both banks
+def is_valid(missionaries, cannibals, total_missionaries, total_cannibals):
+    if missionaries < 0 or cannibals < 0 or missionaries > total_missionaries or cannibals > total_cannibals:
+        return False
+    if missionaries > 0 and missionaries < cannibals:
+        return False
+    other_missionaries = total_missionaries - missionaries
+    other_cannibals = total_cannibals - cannibals
+    if other_missionaries > 0 and other_missionaries < other_cannibals:
+        return False
+    return True
+
+# All boat loads (missionaries, cannibals) for a boat of the given capacity.
+# Missionaries must not be outnumbered inside the boat either.
+def generate_moves(capacity):
+    moves = []
+    for m in range(capacity + 1):
+        for c in range(capacity + 1 - m):
+            if m + c == 0:
+                continue
+            if m > 0 and m < c:
+                continue
+            moves.append((m, c))
+    # Larger loads first so the DFS tends to cross quickly
+    moves.sort(key=lambda move: -(move[0] + move[1]))
+    return moves
+
+def get_successors(code, total_missionaries, total_cannibals, moves):
+    missionaries, cannibals, boat = decode(code, total_cannibals)
+    # People available on the bank where the boat currently is
+    if boat == 1:
+        available_m, available_c, sign = missionaries, cannibals, -1
+    else:
+        available_m = total_missionaries - missionaries
+        available_c = total_cannibals - cannibals
+        sign = 1
+
+    successors = []
+    for m, c in moves:
+        if m > available_m or c > available_c:
+            continue
+        new_m = missionaries + sign * m
+        new_c = cannibals + sign * c
+        if is_valid(new_m, new_c, total_missionaries, total_cannibals):
+            successors.append(encode(new_m, new_c, 1 - boat, total_cannibals))
+    return successors
+
+# Walk the parent map back from the goal to rebuild the path
+def reconstruct_path(parent, goal, total_cannibals):
+    path = []
+    code = goal
+    while code is not None:
+        path.append(decode(code, total_cannibals))
+        code = parent[code]
+    path.reverse()
+    return path
+
+def bfs(total_missionaries, total_cannibals, capacity):
+    moves = generate_moves(capacity)
+    start = encode(total_missionaries, total_cannibals, 1, total_cannibals)
+    goal = encode(0, 0, 0, total_cannibals)
+
+    queue = deque([start])
+    parent = {start: None}
+    nodes_explored = 0
+
+    while queue:
+        code = queue.popleft()
+        nodes_explored += 1
+
+        if code == goal:
+            return reconstruct_path(parent, goal, total_cannibals), nodes_explored
+
+        for successor in get_successors(code, total_missionaries, total_cannibals, moves):
+            if successor not in parent:
+                parent[successor] = code
+                queue.append(successor)
+
+    return None, nodes_explored
+
+def dfs(total_missionaries, total_cannibals, capacity):
+    moves = generate_moves(capacity)
+    start = encode(total_missionaries, total_cannibals, 1, total_cannibals)
+    goal = encode(0, 0, 0, total_cannibals)
+
+    # Stack entries are (state, parent) pairs of ints; the parent is fixed when a state is first expanded
+    stack = [(start, None)]
+    parent = {}
+    nodes_explored = 0
+
+    while stack:
+        code, came_from = stack.pop()
+        if code in parent:
+            continue
+        parent[code] = came_from
+        nodes_explored += 1
+
+        if code == goal:
+            return reconstruct_path(parent, goal, total_cannibals), nodes_explored
+
+        # Reverse so the first generated move is expanded first
+        for successor in reversed(get_successors(code, total_missionaries, total_cannibals, moves)):
+            if successor not in parent:
+                stack.append((successor, code))
+
+    return None, nodes_explored
+
+def solve(total_missionaries, total_cannibals, capacity, method="bfs"):
+    if method == "bfs":
+        return bfs(total_missionaries, total_cannibals, capacity)
+    if method == "dfs":
+        return dfs(total_missionaries, total_cannibals, capacity)
+    raise ValueError(f"Unknown search method: {method}")
+
+
+if __name__ == "__main__":
+    for n, m, k in [(3, 3, 2), (5, 5, 3), (300, 300, 6)]:
+        for method in ["bfs", "dfs"]:
+            solution, nodes_explored = solve(n, m, k, method)
+            print(f"{method.upper()} with {n} missionaries, {m} cannibals, boat capacity {k}:")
+            if solution:
+                print(f"Solution found in {len(solution) - 1} crossings")
+                if len(solution) <= 12:
+                    for step in solution:
+                        print(step)
+            else:
+                print("No solution found.")
+            print(f"Number of nodes explored: {nodes_explored}\n")
@@ -1,4 +1,5 @@
 from collections import deque
+import time
 
 def is_goal(state):
     # The goal state is where all east-bound rabbits are on the right and all west-bound rabbits are on the left.
@@ -59,17 +60,178 @@ def bfs(start_state, goal_state):
 
     return None, nodes_explored
 
-start_state = ["E", "E", "E", "S", "W", "W", "W"]
-goal_state = ["W", "W", "W", "S", "E", "E", "E"]
+# Bitboard mode: a board of length 2n + 1 is stored as (east_mask, west_mask, stone_index),
+# where bit i of east_mask / west_mask is set when an east / west-bound rabbit sits on cell i.
+def make_bitboard(rabbits_per_side):
+    length = 2 * rabbits_per_side + 1
+    east = (1 << rabbits_per_side) - 1
+    west = east << (rabbits_per_side + 1)
+    start = (east, west, rabbits_per_side)
+    goal = (west, east, rabbits_per_side)
+    return start, goal, length
 
-solution,nodes_explored = bfs(start_state, goal_state)
-if solution:
-    print("Solution found:")
-    i=0
-    for step in solution:
-        print("Step ",i,": ",step)
-        i+=1
-else:
-    print("No solution found.")
+def bitboard_to_list(board, length):
+    east, west, _ = board
+    state = []
+    for i in range(length):
+        if east >> i & 1:
+            state.append("E")
+        elif west >> i & 1:
+            state.append("W")
+        else:
+            state.append("S")
+    return state
 
-print(f"Number of nodes explored: {nodes_explored}")
\ No newline at end of file
+def bitboard_successors(board, length):
+    east, west, stone = board
+    stone_bit = 1 << stone
+    successors = []
+    # East-bound rabbits step or jump right into the stone
+    for step in (1, 2):
+        src = stone - step
+        if src >= 0 and east >> src & 1:
+            successors.append((east ^ (1 << src) ^ stone_bit, west, src))
+    # West-bound rabbits step or jump left into the stone
+    for step in (1, 2):
+        src = stone + step
+        if src < length and west >> src & 1:
+            successors.append((east, west ^ (1 << src) ^ stone_bit, src))
+    return successors
+
+def bitboard_predecessors(board, length):
+    east, west, stone = board
+    stone_bit = 1 << stone
+    predecessors = []
+    # Undo an east-bound move: the rabbit right of the stone came from the stone
+    for step in (1, 2):
+        dst = stone + step
+        if dst < length and east >> dst & 1:
+            predecessors.append((east ^ (1 << dst) ^ stone_bit, west, dst))
+    # Undo a west-bound move: the rabbit left of the stone came from the stone
+    for step in (1, 2):
+        dst = stone - step
+        if dst >= 0 and west >> dst & 1:
+            predecessors.append((east, west ^ (1 << dst) ^ stone_bit, dst))
+    return predecessors
+
+# Deadlock patterns for the forward search (the board is padded with a virtual "E" on the
+# left and "W" on the right, which behave like walls):
+#   "EEWW"            - the four rabbits block each other forever
+#   stone then "EE"   - with any west-bound rabbit still to the right
+#   "WW" then stone   - with any east-bound rabbit still to the left
+def is_dead_forward(board, length):
+    east, west, stone = board
+    padded_east = (east << 1) | 1
+    padded_west = (west << 1) | (1 << (length + 1))
+    if padded_east & (padded_east >> 1) & (padded_west >> 2) & (padded_west >> 3):
+        return True
+    if (east >> (stone + 1)) & 3 == 3 and west >> (stone + 3):
+        return True
+    if stone >= 2 and (west >> (stone - 2)) & 3 == 3 and east & ((1 << (stone - 2)) - 1):
+        return True
+    return False
+
+# Running the moves backwards is the forward puzzle mirrored, so the patterns are mirrored too:
+# states matching these can never be reached from the start.
+def is_dead_backward(board, length):
+    east, west, stone = board
+    padded_west = (west << 1) | 1
+    padded_east = (east << 1) | (1 << (length + 1))
+    if padded_west & (padded_west >> 1) & (padded_east >> 2) & (padded_east >> 3):
+        return True
+    if (west >> (stone + 1)) & 3 == 3 and east >> (stone + 3):
+        return True
+    if stone >= 2 and (east >> (stone - 2)) & 3 == 3 and west & ((1 << (stone - 2)) - 1):
+        return True
+    return False
+
+def bidirectional_bfs(rabbits_per_side):
+    start, goal, length = make_bitboard(rabbits_per_side)
+    if start == goal:
+        return [bitboard_to_list(start, length)], 0
+
+    # Parent maps double as visited sets for each direction
+    forward_parent = {start: None}
+    backward_parent = {goal: None}
+    forward_frontier = [start]
+    backward_frontier = [goal]
+    nodes_explored = 0
+    meeting = None
+
+    while forward_frontier and backward_frontier and meeting is None:
+        # Expand the smaller frontier one full layer at a time
+        if len(forward_frontier) <= len(backward_frontier):
+            frontier, parent, other = forward_frontier, forward_parent, backward_parent
+            expand, is_dead = bitboard_successors, is_dead_forward
+        else:
+            frontier, parent, other = backward_frontier, backward_parent, forward_parent
+            expand, is_dead = bitboard_predecessors, is_dead_backward
+
+        next_frontier = []
+        for board in frontier:
+            nodes_explored += 1
+            for neighbor in expand(board, length):
+                if neighbor in parent or is_dead(neighbor, length):
+                    continue
+                parent[neighbor] = board
+                if neighbor in other:
+                    meeting = neighbor
+                    break
+                next_frontier.append(neighbor)
+            if meeting is not None:
+                break
+
+        if parent is forward_parent:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+
+    if meeting is None:
+        return None, nodes_explored
+
+    # Stitch start -> meeting and meeting -> goal from the two parent maps
+    path = []
+    board = meeting
+    while board is not None:
+        path.append(board)
+        board = forward_parent[board]
+    path.reverse()
+    board = backward_parent[meeting]
+    while board is not None:
+        path.append(board)
+        board = backward_parent[board]
+
+    return [bitboard_to_list(board, length) for board in path], nodes_explored
+
+
+if __name__ == "__main__":
+    start_state = ["E", "E", "E", "S", "W", "W", "W"]
+    goal_state = ["W", "W", "W", "S", "E", "E", "E"]
+
+    solution,nodes_explored = bfs(start_state, goal_state)
+    if solution:
+        print("Solution found:")
+        i=0
+        for step in solution:
+            print("Step ",i,": ",step)
+            i+=1
+    else:
+        print("No solution found.")
+
+    print(f"Number of nodes explored: {nodes_explored}")
+
+    # Bitboard bidirectional mode for larger boards
+    for rabbits_per_side in [3, 15, 20, 25]:
+        start_time = time.perf_counter()
+        solution, nodes_explored = bidirectional_bfs(rabbits_per_side)
+        elapsed = time.perf_counter() - start_time
+        print(f"\nBidirectional BFS with {rabbits_per_side} rabbits per side:")
+        if solution:
+            print(f"Solution found in {len(solution) - 1} moves")
+            if rabbits_per_side <= 3:
+                for i, step in enumerate(solution):
+                    print("Step ", i, ": ", step)
+        else:
+            print("No solution found.")
+        print(f"Number of nodes explored: {nodes_explored}")
+        print(f"Nodes/sec: {nodes_explored / max(elapsed, 1e-9):.0f}")
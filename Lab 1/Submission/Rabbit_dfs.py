@@ -58,17 +58,164 @@ def dfs(start_state, goal_state):
 
     return None, nodes_explored  # Return None and the count if no solution is found
 
-start_state = ["E", "E", "E", "S", "W", "W", "W"]
-goal_state = ["W", "W", "W", "S", "E", "E", "E"]
-
-solution, nodes_explored = dfs(start_state, goal_state)
-if solution:
-    print("Solution found:")
-    i=0
-    for step in solution:
-        print("Step ",i,": ",step)
-        i+=1
-else:
-    print("No solution found.")
-
-print(f"Number of nodes explored: {nodes_explored}")
+# Iterative deepening mode: only the current path is kept in memory. The board is a single list
+# that is modified in place and restored on backtrack, and states on the current path are tracked
+# by an incrementally updated integer key (2 bits per cell).
+CELL_CODES = {"S": 0, "E": 1, "W": 2}
+
+def board_key(board):
+    key = 0
+    for i, cell in enumerate(board):
+        key |= CELL_CODES[cell] << (2 * i)
+    return key
+
+def legal_moves(board, stone_index):
+    # A move is the index of the rabbit that steps or jumps into the stone
+    moves = []
+    for src in (stone_index - 1, stone_index - 2):
+        if src >= 0 and board[src] == "E":
+            moves.append(src)
+    for src in (stone_index + 1, stone_index + 2):
+        if src < len(board) and board[src] == "W":
+            moves.append(src)
+    return moves
+
+def is_dead_end(board, stone_index):
+    # Rabbits never move backwards, so these local patterns can never be untangled:
+    # two east-bound rabbits just right of the stone with a west-bound rabbit behind them,
+    # or two west-bound rabbits just left of the stone with an east-bound rabbit behind them.
+    n = len(board)
+    if stone_index + 2 < n and board[stone_index + 1] == "E" and board[stone_index + 2] == "E":
+        if "W" in board[stone_index + 3:]:
+            return True
+    if stone_index >= 2 and board[stone_index - 1] == "W" and board[stone_index - 2] == "W":
+        if "E" in board[:stone_index - 2]:
+            return True
+    # "EEWW" around the stone's old neighbourhood (cells off the board act as walls)
+    for i in range(max(-1, stone_index - 5), min(n - 2, stone_index + 3)):
+        window = [board[j] if 0 <= j < n else ("E" if j < 0 else "W") for j in range(i, i + 4)]
+        if window == ["E", "E", "W", "W"]:
+            return True
+    return False
+
+def depth_limited_search(board, goal_key, limit, stats):
+    stone_index = board.index("S")
+    key = board_key(board)
+    on_path = {key}
+    moves_made = []
+    # Each frame holds the untried moves from one state on the current path
+    stack = [legal_moves(board, stone_index)]
+    frontier = len(stack[0])
+    cutoff = False
+
+    if key == goal_key:
+        yield []
+        return
+
+    while stack:
+        stats["peak_frontier"] = max(stats["peak_frontier"], frontier)
+        if not stack[-1]:
+            # Backtrack: undo the move that led to this state
+            stack.pop()
+            if moves_made:
+                src, old_stone = moves_made.pop()
+                on_path.discard(key)
+                rabbit = board[old_stone]
+                key ^= (CELL_CODES[rabbit] << (2 * old_stone)) ^ (CELL_CODES[rabbit] << (2 * src))
+                board[src], board[old_stone] = rabbit, "S"
+                stone_index = old_stone
+            continue
+
+        src = stack[-1].pop()
+        frontier -= 1
+        old_stone = stone_index
+        rabbit = board[src]
+        new_key = key ^ (CELL_CODES[rabbit] << (2 * src)) ^ (CELL_CODES[rabbit] << (2 * old_stone))
+        if new_key in on_path:
+            continue
+
+        # Apply the move in place
+        board[old_stone], board[src] = rabbit, "S"
+        stone_index = src
+        key = new_key
+        on_path.add(key)
+        moves_made.append((src, old_stone))
+        stats["nodes_explored"] += 1
+
+        if key == goal_key:
+            yield [src for src, _ in moves_made]
+            next_moves = []
+        elif len(moves_made) >= limit:
+            cutoff = True
+            next_moves = []
+        elif is_dead_end(board, stone_index):
+            next_moves = []
+        else:
+            next_moves = legal_moves(board, stone_index)
+        stack.append(next_moves)
+        frontier += len(next_moves)
+
+    stats["cutoff"] = cutoff
+
+def iddfs(start_state, goal_state, max_depth=None, stats=None):
+    """Yield every solution (as a list of states) at the shallowest depth that has one."""
+    if stats is None:
+        stats = {}
+    stats.update(nodes_explored=0, peak_frontier=0, depth=0)
+    goal_key = board_key(goal_state)
+    if max_depth is None:
+        # Every move advances one rabbit, so no solution is longer than the total distance travelled
+        max_depth = len(start_state) ** 2
+
+    for limit in range(max_depth + 1):
+        stats["depth"] = limit
+        board = list(start_state)
+        found = False
+        for moves in depth_limited_search(board, goal_key, limit, stats):
+            found = True
+            yield replay_moves(start_state, moves)
+        if found or not stats["cutoff"]:
+            return
+
+def replay_moves(start_state, moves):
+    state = list(start_state)
+    path = [state[:]]
+    for src in moves:
+        stone_index = state.index("S")
+        state[stone_index], state[src] = state[src], "S"
+        path.append(state[:])
+    return path
+
+
+if __name__ == "__main__":
+    start_state = ["E", "E", "E", "S", "W", "W", "W"]
+    goal_state = ["W", "W", "W", "S", "E", "E", "E"]
+
+    solution, nodes_explored = dfs(start_state, goal_state)
+    if solution:
+        print("Solution found:")
+        i=0
+        for step in solution:
+            print("Step ",i,": ",step)
+            i+=1
+    else:
+        print("No solution found.")
+
+    print(f"Number of nodes explored: {nodes_explored}")
+
+    # Iterative deepening mode
+    for rabbits_per_side in [3, 6]:
+        start_state = ["E"] * rabbits_per_side + ["S"] + ["W"] * rabbits_per_side
+        goal_state = ["W"] * rabbits_per_side + ["S"] + ["E"] * rabbits_per_side
+        stats = {}
+        solutions = list(iddfs(start_state, goal_state, stats=stats))
+        print(f"\nIDDFS with {rabbits_per_side} rabbits per side:")
+        if solutions:
+            print(f"{len(solutions)} solution(s) found at depth {stats['depth']}")
+            if rabbits_per_side <= 3:
+                for i, step in enumerate(solutions[0]):
+                    print("Step ", i, ": ", step)
+        else:
+            print("No solution found.")
+        print(f"Number of nodes explored: {stats['nodes_explored']}")
+        print(f"Peak frontier size: {stats['peak_frontier']}")
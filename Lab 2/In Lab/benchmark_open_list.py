@@ -0,0 +1,79 @@
+import heapq
+import random
+import time
+from puzzle_eight_a_star import a_star_search, get_successors, manhattan_distance, is_goal
+
+# Compares the original heapq open list, which stores (f, state, path) tuples, with the
+# bucket-queue A* in puzzle_eight_a_star.py on the same random solvable 8-puzzle instances.
+# Both expand nodes at about the same rate, since the Manhattan heuristic dominates the cost
+# of a node; the bucket queue finishes sooner because its deepest-first tie-break expands
+# fewer nodes, and it keeps one parent pointer per node instead of a copy of the path.
+
+def heapq_a_star_search(start_state, goal_state):
+    # The previous implementation, instrumented to count expanded nodes
+    open_list = []
+    heapq.heappush(open_list, (0, start_state, []))
+    closed_list = set()
+    nodes_expanded = 0
+
+    while open_list:
+        _, current_state, path = heapq.heappop(open_list)
+        if tuple(current_state) in closed_list:
+            continue
+        closed_list.add(tuple(current_state))
+        nodes_expanded += 1
+        path = path + [current_state]
+
+        if is_goal(current_state, goal_state):
+            return path, nodes_expanded
+
+        for successor in get_successors(current_state):
+            if tuple(successor) not in closed_list:
+                cost = len(path) + manhattan_distance(successor, goal_state)
+                heapq.heappush(open_list, (cost, successor, path))
+
+    return None, nodes_expanded
+
+def random_instance(goal_state, num_moves, rng):
+    # Random walk from the goal, so every instance is solvable
+    state = goal_state[:]
+    for _ in range(num_moves):
+        state = rng.choice(get_successors(state))
+    return state
+
+def run_benchmark(num_instances=200, scramble_moves=60, repeats=5, seed=0):
+    rng = random.Random(seed)
+    goal_state = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+    instances = [random_instance(goal_state, scramble_moves, rng) for _ in range(num_instances)]
+
+    # Best of several passes, since a single pass is short enough to be dominated by noise
+    heap_time = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        heap_nodes = 0
+        heap_lengths = []
+        for state in instances:
+            path, nodes = heapq_a_star_search(state, goal_state)
+            heap_nodes += nodes
+            heap_lengths.append(len(path))
+        heap_time = min(heap_time, time.perf_counter() - start)
+
+    bucket_time = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        bucket_nodes = 0
+        bucket_lengths = []
+        for state in instances:
+            stats = {}
+            path = a_star_search(state, goal_state, stats)
+            bucket_nodes += stats["nodes_expanded"]
+            bucket_lengths.append(len(path))
+        bucket_time = min(bucket_time, time.perf_counter() - start)
+
+    print(f"{num_instances} instances, {scramble_moves} scramble moves each, best of {repeats} passes")
+    print(f"heapq  : {heap_nodes} nodes in {heap_time:.2f}s ({heap_nodes / heap_time:.0f} nodes/sec)")
+    print(f"bucket : {bucket_nodes} nodes in {bucket_time:.2f}s ({bucket_nodes / bucket_time:.0f} nodes/sec)")
+    print(f"Same solution lengths: {heap_lengths == bucket_lengths}")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -1,6 +1,10 @@
-import heapq
+import os
 import random
+import sys
 from collections import deque
+# Shared modules live in common/ at the repository root (see common/README.md)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common"))
+from bucket_queue import BucketQueue
 
 def move_up(state):
     new_state = state[:]
@@ -58,26 +62,42 @@ def manhattan_distance(state, goal_state):
     return distance
 
 # Graph Search Agent with A* Search (we can change to BFS or DFS)
-def a_star_search(start_state, goal_state):
-    open_list = []
-    heapq.heappush(open_list, (0, start_state, []))
-    closed_list = set()
+def a_star_search(start_state, goal_state, stats=None):
+    open_list = BucketQueue()
+    items, costs = open_list.items, open_list.g
+    # Queue items are the hashable state keys, so each state is converted to a tuple once
+    start_key = tuple(start_state)
+    open_list.push(start_key, 0, manhattan_distance(start_state, goal_state))
+    # Best known g per state. Manhattan distance is consistent, so a state is never reached
+    # more cheaply once expanded and this dict doubles as the closed list.
+    best_g = {start_key: 0}
+    nodes_expanded = 0
 
     while open_list:
-        _, current_state, path = heapq.heappop(open_list)
-        if tuple(current_state) in closed_list:
+        node = open_list.pop()
+        key = items[node]
+        g = costs[node]
+        # Skip stale entries that were later reached more cheaply
+        if g > best_g[key]:
             continue
-        closed_list.add(tuple(current_state))
-        path = path + [current_state]
+        nodes_expanded += 1
+        current_state = list(key)
 
         if is_goal(current_state, goal_state):
-            return path
+            if stats is not None:
+                stats["nodes_expanded"] = nodes_expanded
+                stats["peak_open"] = open_list.peak_size
+            return [list(state) for state in open_list.path(node)]
 
         for successor in get_successors(current_state):
-            if tuple(successor) not in closed_list:
-                cost = len(path) + manhattan_distance(successor, goal_state)
-                heapq.heappush(open_list, (cost, successor, path))
-
+            successor_key = tuple(successor)
+            if g + 1 < best_g.get(successor_key, float("inf")):
+                best_g[successor_key] = g + 1
+                open_list.push(successor_key, g + 1, manhattan_distance(successor, goal_state), node)
+
+    if stats is not None:
+        stats["nodes_expanded"] = nodes_expanded
+        stats["peak_open"] = open_list.peak_size
     return None
 
 def backtrack_path(came_from, start_state, goal_state):
@@ -93,18 +113,19 @@ def backtrack_path(came_from, start_state, goal_state):
     return path
 
 # Example 
-goal_state = [1, 2, 3, 4, 5, 6, 7, 8, 0]
-initial_state = [8, 3, 0, 7, 1, 6, 2, 5, 4] 
-
-print("Initial State:")
-print_state(initial_state)
-
-solution_path = a_star_search(initial_state, goal_state)
-
-if solution_path:
-    print("Solution found:")
-    for i, step in enumerate(solution_path):
-        print(f"Step {i + 1}:")
-        print_state(step)
-else:
-    print("No solution found.")
+if __name__ == "__main__":
+    goal_state = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+    initial_state = [8, 3, 0, 7, 1, 6, 2, 5, 4] 
+
+    print("Initial State:")
+    print_state(initial_state)
+
+    solution_path = a_star_search(initial_state, goal_state)
+
+    if solution_path:
+        print("Solution found:")
+        for i, step in enumerate(solution_path):
+            print(f"Step {i + 1}:")
+            print_state(step)
+    else:
+        print("No solution found.")
@@ -0,0 +1,166 @@
+import mmap
+import os
+from collections import deque
+
+# Exhaustive distance table for the 8-puzzle.
+# A single retrograde BFS from the goal stores the optimal move count of every reachable
+# state in a byte array indexed by permutation rank (9! entries, 255 = unreachable).
+# The table is written to disk once and memory-mapped afterwards, so every lookup is O(1)
+# and the optimal move sequence is recovered by walking downhill through the table.
+
+GOAL_STATE = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+SIZE = 3
+NUM_CELLS = SIZE * SIZE
+UNREACHABLE = 255
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "puzzle_eight_distances.bin")
+
+FACTORIALS = [1] * (NUM_CELLS + 1)
+for i in range(1, NUM_CELLS + 1):
+    FACTORIALS[i] = FACTORIALS[i - 1] * i
+TABLE_SIZE = FACTORIALS[NUM_CELLS]
+
+# Neighbouring cells of the blank for every blank position
+NEIGHBORS = []
+for index in range(NUM_CELLS):
+    row, col = divmod(index, SIZE)
+    cells = []
+    if row > 0:
+        cells.append(index - SIZE)
+    if row < SIZE - 1:
+        cells.append(index + SIZE)
+    if col > 0:
+        cells.append(index - 1)
+    if col < SIZE - 1:
+        cells.append(index + 1)
+    NEIGHBORS.append(cells)
+
+# Lehmer-code rank of a permutation of 0..8
+def rank(state):
+    result = 0
+    for i in range(NUM_CELLS):
+        smaller = 0
+        for j in range(i + 1, NUM_CELLS):
+            if state[j] < state[i]:
+                smaller += 1
+        result += smaller * FACTORIALS[NUM_CELLS - 1 - i]
+    return result
+
+def unrank(code):
+    remaining = list(range(NUM_CELLS))
+    state = []
+    for i in range(NUM_CELLS):
+        index, code = divmod(code, FACTORIALS[NUM_CELLS - 1 - i])
+        state.append(remaining.pop(index))
+    return state
+
+def get_successors(state):
+    blank = state.index(0)
+    successors = []
+    for cell in NEIGHBORS[blank]:
+        new_state = state[:]
+        new_state[blank], new_state[cell] = new_state[cell], new_state[blank]
+        successors.append(new_state)
+    return successors
+
+# Solvable iff the number of inversions among the tiles (blank excluded) is even,
+# which is the parity of the goal state for an odd board width
+def is_solvable(state):
+    tiles = [tile for tile in state if tile != 0]
+    inversions = 0
+    for i in range(len(tiles)):
+        for j in range(i + 1, len(tiles)):
+            if tiles[i] > tiles[j]:
+                inversions += 1
+    return inversions % 2 == 0
+
+def build_table(path=TABLE_PATH):
+    """Run the retrograde BFS from the goal and write the distance table to path."""
+    table = bytearray([UNREACHABLE]) * TABLE_SIZE
+    goal_rank = rank(GOAL_STATE)
+    table[goal_rank] = 0
+    queue = deque([GOAL_STATE])
+
+    while queue:
+        state = queue.popleft()
+        distance = table[rank(state)] + 1
+        for successor in get_successors(state):
+            successor_rank = rank(successor)
+            if table[successor_rank] == UNREACHABLE:
+                table[successor_rank] = distance
+                queue.append(successor)
+
+    with open(path, "wb") as f:
+        f.write(table)
+    return table
+
+def load_table(path=TABLE_PATH):
+    """Memory-map the distance table, building it first if it is not on disk yet."""
+    if not os.path.exists(path) or os.path.getsize(path) != TABLE_SIZE:
+        build_table(path)
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def optimal_length(table, state):
+    """Optimal number of moves for state, or None if it cannot reach the goal."""
+    distance = table[rank(state)]
+    if distance == UNREACHABLE:
+        return None
+    return distance
+
+def solution_path(table, state):
+    """Follow strictly decreasing distances from state to the goal; no search involved."""
+    distance = optimal_length(table, state)
+    if distance is None:
+        return None
+    path = [state]
+    while distance > 0:
+        for successor in get_successors(state):
+            if table[rank(successor)] == distance - 1:
+                state = successor
+                break
+        distance -= 1
+        path.append(state)
+    return path
+
+def solve_batch(states, table=None, with_paths=False):
+    """Solve many instances with table lookups only.
+
+    Returns one (solvable, optimal_length, path) tuple per state; the path is only
+    filled in when with_paths is set.
+    """
+    if table is None:
+        table = load_table()
+    results = []
+    for state in states:
+        if not is_solvable(state):
+            results.append((False, None, None))
+            continue
+        path = solution_path(table, state) if with_paths else None
+        results.append((True, table[rank(state)], path))
+    return results
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    start = time.perf_counter()
+    table = load_table()
+    print(f"Distance table ready in {time.perf_counter() - start:.2f}s ({TABLE_SIZE} entries)")
+
+    initial_state = [8, 3, 0, 7, 1, 6, 2, 5, 4]
+    (solvable, length, path), = solve_batch([initial_state], table, with_paths=True)
+    print(f"Initial state {initial_state}: solvable={solvable}, optimal moves={length}")
+    for i, step in enumerate(path):
+        print(f"Step {i + 1}: {step}")
+
+    states = []
+    for _ in range(10000):
+        state = GOAL_STATE[:]
+        random.shuffle(state)
+        states.append(state)
+    start = time.perf_counter()
+    results = solve_batch(states, table)
+    elapsed = time.perf_counter() - start
+    solvable_count = sum(1 for solvable, _, _ in results if solvable)
+    print(f"Batch of {len(states)} instances: {solvable_count} solvable, solved in {elapsed:.3f}s")
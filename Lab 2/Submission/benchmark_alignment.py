@@ -0,0 +1,53 @@
+import random
+import time
+from plagarism_detection import a_star_alignment, dp_alignment, cached_edit_distance
+
+# Times a_star_alignment against dp_alignment on synthetic documents of growing length.
+# doc2 is a copy of doc1 with some sentences reworded, dropped or inserted.
+
+WORDS = ("the a cat dog sat on mat quick brown fox jumps over lazy river bank model data "
+         "search graph state cost path node heuristic sentence paragraph result").split()
+
+def random_sentence(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 15)))
+
+def make_documents(num_sentences, rng):
+    doc1 = [random_sentence(rng) for _ in range(num_sentences)]
+    doc2 = []
+    for sentence in doc1:
+        roll = rng.random()
+        if roll < 0.1:
+            continue
+        if roll < 0.3:
+            words = sentence.split()
+            words[rng.randrange(len(words))] = rng.choice(WORDS)
+            sentence = " ".join(words)
+        elif roll < 0.4:
+            doc2.append(random_sentence(rng))
+        doc2.append(sentence)
+    return doc1, doc2
+
+def run_benchmark(sizes=(5, 10, 20, 40, 80, 160, 320), a_star_limit=40, seed=0):
+    rng = random.Random(seed)
+    print(f"{'sentences':>9} {'A* (s)':>10} {'DP (s)':>10} {'A* cost':>8} {'DP cost':>8}")
+    for size in sizes:
+        doc1, doc2 = make_documents(size, rng)
+
+        a_star_time, a_star_cost = None, None
+        if size <= a_star_limit:
+            cached_edit_distance.cache_clear()
+            start = time.perf_counter()
+            a_star_cost, _ = a_star_alignment(doc1, doc2)
+            a_star_time = time.perf_counter() - start
+
+        cached_edit_distance.cache_clear()
+        start = time.perf_counter()
+        dp_cost, _ = dp_alignment(doc1, doc2)
+        dp_time = time.perf_counter() - start
+
+        a_star_column = f"{a_star_time:10.3f}" if a_star_time is not None else f"{'skipped':>10}"
+        a_star_cost_column = f"{a_star_cost:8}" if a_star_cost is not None else f"{'-':>8}"
+        print(f"{size:9} {a_star_column} {dp_time:10.3f} {a_star_cost_column} {dp_cost:8}")
+
+if __name__ == "__main__":
+    run_benchmark()
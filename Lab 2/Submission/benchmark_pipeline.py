@@ -0,0 +1,113 @@
+import os
+import random
+import sys
+import time
+from plagarism_detection import (preprocess_text, a_star_alignment, dp_alignment, detect_plagiarism,
+                                 cached_edit_distance, edit_distance_counts)
+from benchmark_alignment import WORDS, random_sentence
+# Shared modules live in common/ at the repository root (see common/README.md)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common"))
+from benchmark_results import write_results
+
+# End-to-end benchmark of the plagiarism pipeline on synthetic document pairs.
+# doc2 is derived from doc1 with controlled paraphrase rates: sentences are deleted, new ones
+# inserted, neighbours swapped and single words substituted. Every stage (preprocessing,
+# alignment, detection) is timed separately together with its edit-distance work as counted
+# by plagarism_detection: sentence pairs asked for (through edit_distance or the vectorized
+# sentence_cost_matrix kernel) and pairs that actually went through a kernel, i.e. neither
+# identical nor cached nor ruled out by length. A* also reports nodes expanded and the peak size of its heap. Results are
+# written as JSON or CSV (chosen by the file extension) so runs can be diffed for regressions.
+
+FIELDS = ["sentences", "insert_rate", "delete_rate", "reorder_rate", "substitute_rate", "method",
+          "stage", "seconds", "edit_distance_calls", "edit_distances_computed", "nodes_expanded",
+          "peak_open", "alignment_cost", "plagiarized_pairs"]
+
+def make_document_pair(num_sentences, rng, insert_rate=0.1, delete_rate=0.1, reorder_rate=0.1,
+                       substitute_rate=0.2):
+    """Return (text1, text2) where text2 is a paraphrase of text1 at the given rates."""
+    original = [random_sentence(rng) for _ in range(num_sentences)]
+    paraphrase = []
+    for sentence in original:
+        if rng.random() < delete_rate:
+            continue
+        if rng.random() < substitute_rate:
+            words = sentence.split()
+            words[rng.randrange(len(words))] = rng.choice(WORDS)
+            sentence = " ".join(words)
+        if rng.random() < insert_rate:
+            paraphrase.append(random_sentence(rng))
+        paraphrase.append(sentence)
+    for k in range(len(paraphrase) - 1):
+        if rng.random() < reorder_rate:
+            paraphrase[k], paraphrase[k + 1] = paraphrase[k + 1], paraphrase[k]
+    return ". ".join(original) + ".", ". ".join(paraphrase) + "."
+
+def run_stage(record, stage, function, *args, **kwargs):
+    before = dict(edit_distance_counts)
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    record["stage"] = stage
+    record["seconds"] = time.perf_counter() - start
+    record["edit_distance_calls"] = edit_distance_counts["calls"] - before["calls"]
+    record["edit_distances_computed"] = edit_distance_counts["computed"] - before["computed"]
+    return result
+
+def benchmark_pair(text1, text2, base, method, skip_penalty=5, threshold=10):
+    """Run the pipeline once and return one result row per stage."""
+    cached_edit_distance.cache_clear()
+    rows = []
+
+    row = dict(base, method=method)
+    doc1, doc2 = run_stage(row, "preprocess", lambda: (preprocess_text(text1), preprocess_text(text2)))
+    rows.append(row)
+
+    row = dict(base, method=method)
+    stats = {}
+    if method == "dp":
+        cost, alignment = run_stage(row, "alignment", dp_alignment, doc1, doc2, skip_penalty)
+    else:
+        cost, alignment = run_stage(row, "alignment", a_star_alignment, doc1, doc2, skip_penalty, stats=stats)
+    row.update(stats, alignment_cost=cost)
+    rows.append(row)
+
+    row = dict(base, method=method)
+    pairs = run_stage(row, "detect", detect_plagiarism, alignment, doc1, doc2, threshold)
+    row["plagiarized_pairs"] = len(pairs)
+    rows.append(row)
+
+    row = dict(base, method=method, stage="total")
+    for field in ("seconds", "edit_distance_calls", "edit_distances_computed"):
+        row[field] = sum(stage_row[field] for stage_row in rows)
+    rows.append(row)
+    return rows
+
+def run_benchmark(sizes=(5, 10, 20, 40, 80, 160), rates=((0.1, 0.1, 0.1, 0.2),), methods=("a_star", "dp"),
+                  a_star_limit=40, seed=0):
+    rng = random.Random(seed)
+    results = []
+    for insert_rate, delete_rate, reorder_rate, substitute_rate in rates:
+        for size in sizes:
+            text1, text2 = make_document_pair(size, rng, insert_rate, delete_rate, reorder_rate, substitute_rate)
+            base = {"sentences": size, "insert_rate": insert_rate, "delete_rate": delete_rate,
+                    "reorder_rate": reorder_rate, "substitute_rate": substitute_rate}
+            for method in methods:
+                if method == "a_star" and size > a_star_limit:
+                    continue
+                results.extend(benchmark_pair(text1, text2, base, method))
+    return results
+
+def print_results(results):
+    print(f"{'sentences':>9} {'method':>7} {'stage':>10} {'seconds':>9} {'ed calls':>9} "
+          f"{'ed computed':>11} {'nodes':>7} {'peak open':>9}")
+    for row in results:
+        print(f"{row['sentences']:9} {row['method']:>7} {row['stage']:>10} {row['seconds']:9.4f} "
+              f"{row['edit_distance_calls']:9} {row['edit_distances_computed']:11} "
+              f"{row.get('nodes_expanded', '-'):>7} {row.get('peak_open', '-'):>9}")
+
+
+if __name__ == "__main__":
+    output = sys.argv[1] if len(sys.argv) > 1 else "benchmark_pipeline.json"
+    results = run_benchmark(rates=((0.1, 0.1, 0.1, 0.2), (0.3, 0.3, 0.3, 0.5)))
+    print_results(results)
+    write_results(results, output, FIELDS)
+    print(f"Results written to {output}")
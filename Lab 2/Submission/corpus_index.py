@@ -0,0 +1,189 @@
+import os
+import zlib
+from multiprocessing import Pool
+import numpy as np
+from plagarism_detection import (preprocess_text, a_star_alignment, dp_alignment,
+                                 detect_plagiarism, classify_plagiarism)
+
+# MinHash / LSH index over a corpus of documents.
+# Every document is reduced to the set of word shingles of its preprocessed sentences, the set
+# is summarised by a MinHash signature, and signatures are split into bands that are hashed
+# into buckets. Documents sharing a bucket with a submission are candidates; they are ranked
+# by the fraction of equal signature values (an estimate of the Jaccard similarity) and only
+# the top candidates go through the full sentence alignment.
+
+MERSENNE_PRIME = (1 << 31) - 1
+
+def shingles(text, shingle_size=3):
+    result = set()
+    for sentence in preprocess_text(text):
+        words = sentence.split()
+        if len(words) < shingle_size:
+            if words:
+                result.add(" ".join(words))
+            continue
+        for i in range(len(words) - shingle_size + 1):
+            result.add(" ".join(words[i:i + shingle_size]))
+    return result
+
+class CorpusIndex:
+    def __init__(self, num_perm=128, bands=64, shingle_size=3, seed=1):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        # Universal hash functions h(x) = (a * x + b) mod p, one per permutation
+        self.a = rng.integers(1, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self.doc_ids = []
+        # Signature rows live in a buffer whose capacity doubles when it is full
+        self.buffer = np.empty((16, num_perm), dtype=np.uint64)
+        self.buckets = [{} for _ in range(bands)]
+
+    @property
+    def signatures(self):
+        return self.buffer[:len(self.doc_ids)]
+
+    def reserve(self, rows):
+        if rows > len(self.buffer):
+            buffer = np.empty((max(rows, 2 * len(self.buffer)), self.num_perm), dtype=np.uint64)
+            buffer[:len(self.doc_ids)] = self.signatures
+            self.buffer = buffer
+
+    def signature(self, text):
+        values = [zlib.crc32(shingle.encode()) % MERSENNE_PRIME for shingle in shingles(text, self.shingle_size)]
+        if not values:
+            return np.full(self.num_perm, MERSENNE_PRIME, dtype=np.uint64)
+        hashes = np.array(values, dtype=np.uint64)
+        permuted = (hashes[:, None] * self.a[None, :] + self.b[None, :]) % MERSENNE_PRIME
+        return permuted.min(axis=0)
+
+    def band_keys(self, signature):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def insert(self, doc_id, signature):
+        position = len(self.doc_ids)
+        self.reserve(position + 1)
+        self.buffer[position] = signature
+        self.doc_ids.append(doc_id)
+        for band, key in enumerate(self.band_keys(signature)):
+            self.buckets[band].setdefault(key, []).append(position)
+
+    def add(self, doc_id, text):
+        """Index one more document; the index can be grown at any time."""
+        self.insert(doc_id, self.signature(text))
+
+    def add_many(self, documents):
+        for doc_id, text in documents:
+            self.insert(doc_id, self.signature(text))
+
+    def query(self, text, k=10):
+        """Return up to k (doc_id, estimated Jaccard similarity) pairs, most similar first."""
+        signature = self.signature(text)
+        candidates = set()
+        for band, key in enumerate(self.band_keys(signature)):
+            candidates.update(self.buckets[band].get(key, ()))
+        if not candidates:
+            return []
+        positions = np.fromiter(candidates, dtype=np.int64)
+        similarity = (self.signatures[positions] == signature[None, :]).mean(axis=1)
+        order = np.argsort(-similarity, kind="stable")[:k]
+        return [(self.doc_ids[positions[i]], float(similarity[i])) for i in order]
+
+    @staticmethod
+    def npz_path(path):
+        # np.savez appends .npz to paths without it, so load has to look for the same name
+        return path if path.endswith(".npz") else path + ".npz"
+
+    def save(self, path):
+        """Write the index to path (.npz); document ids must be str or int and keep their type."""
+        for doc_id in self.doc_ids:
+            if type(doc_id) not in (str, int):
+                raise TypeError(f"document id {doc_id!r} is not a str or int and cannot be saved")
+        np.savez(self.npz_path(path), doc_ids=np.array([str(doc_id) for doc_id in self.doc_ids], dtype=str),
+                 doc_id_is_int=np.array([type(doc_id) is int for doc_id in self.doc_ids], dtype=bool),
+                 signatures=self.signatures, params=np.array([self.num_perm, self.bands, self.shingle_size, self.seed]))
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(cls.npz_path(path))
+        num_perm, bands, shingle_size, seed = (int(x) for x in data["params"])
+        index = cls(num_perm, bands, shingle_size, seed)
+        signatures = data["signatures"]
+        doc_ids = data["doc_ids"].tolist()
+        # Ids are stored as strings; int ids are turned back into ints so corpus lookups still work
+        if "doc_id_is_int" in data:
+            doc_ids = [int(doc_id) if is_int else doc_id
+                       for doc_id, is_int in zip(doc_ids, data["doc_id_is_int"].tolist())]
+        index.reserve(len(signatures))
+        # Buckets are cheap to rebuild from the stored signatures
+        for doc_id, signature in zip(doc_ids, signatures):
+            index.insert(doc_id, signature)
+        return index
+
+def align_candidate(args):
+    doc_id, submission, candidate_text, threshold, skip_penalty, method = args
+    processed_submission = preprocess_text(submission)
+    processed_candidate = preprocess_text(candidate_text)
+    if method == "dp":
+        cost, alignment = dp_alignment(processed_submission, processed_candidate, skip_penalty)
+    else:
+        cost, alignment = a_star_alignment(processed_submission, processed_candidate, skip_penalty)
+    plagiarized_pairs = detect_plagiarism(alignment, processed_submission, processed_candidate, threshold)
+    total_sentences = max(len(processed_submission), len(processed_candidate), 1)
+    return doc_id, cost, plagiarized_pairs, classify_plagiarism(plagiarized_pairs, total_sentences)
+
+def check_submission(submission, index, corpus, k=10, threshold=10, skip_penalty=5,
+                     method="dp", processes=None):
+    """Align a submission against its top-k LSH candidates in a process pool.
+
+    corpus maps doc_id to document text. Returns (doc_id, similarity, cost, pairs, classification)
+    for every candidate, most similar first.
+    """
+    candidates = index.query(submission, k)
+    tasks = [(doc_id, submission, corpus[doc_id], threshold, skip_penalty, method) for doc_id, _ in candidates]
+    if processes == 1 or len(tasks) <= 1:
+        results = [align_candidate(task) for task in tasks]
+    else:
+        with Pool(processes) as pool:
+            results = pool.map(align_candidate, tasks)
+    similarity = dict(candidates)
+    return [(doc_id, similarity[doc_id], cost, pairs, classification)
+            for doc_id, cost, pairs, classification in results]
+
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+    import time
+
+    rng = random.Random(0)
+    words = ("the a cat dog sat on mat quick brown fox jumps over lazy river bank model data search "
+             "graph state cost path node heuristic result method paper study analysis").split()
+
+    def random_document(num_sentences):
+        return ". ".join(" ".join(rng.choice(words) for _ in range(rng.randint(6, 14)))
+                         for _ in range(num_sentences)) + "."
+
+    corpus = {f"doc{i}": random_document(20) for i in range(2000)}
+    start = time.perf_counter()
+    index = CorpusIndex()
+    index.add_many(corpus.items())
+    print(f"Indexed {len(corpus)} documents in {time.perf_counter() - start:.2f}s")
+
+    path = os.path.join(tempfile.mkdtemp(), "corpus_index.npz")
+    index.save(path)
+    index = CorpusIndex.load(path)
+
+    # A submission that copies half of doc42
+    sentences = corpus["doc42"].split(". ")
+    submission = ". ".join(sentences[:10]) + ". " + random_document(10)
+    start = time.perf_counter()
+    for doc_id, similarity, cost, pairs, classification in check_submission(submission, index, corpus, k=5):
+        print(f"{doc_id}: similarity {similarity:.2f}, alignment cost {cost}, "
+              f"{len(pairs)} plagiarized pairs, {classification}")
+    print(f"Checked submission in {time.perf_counter() - start:.2f}s")
@@ -1,54 +1,138 @@
+import codecs
+import hashlib
 import heapq
+import itertools
+from functools import lru_cache
+import numpy as np
 
 # Step 1: Text Preprocessing without using re
+# Translation table that lets str.translate drop punctuation in one pass. Characters are
+# classified on first use and remembered, so any Unicode text keeps the same
+# "alphanumeric or whitespace" rule as before.
+class PunctuationTable(dict):
+    def __missing__(self, code):
+        char = chr(code)
+        value = code if char.isalnum() or char.isspace() else None
+        self[code] = value
+        return value
+
+PUNCTUATION_TABLE = PunctuationTable()
+
+def normalize_sentence(sentence):
+    # Lowercase and strip punctuation; the caller has already dropped empty sentences
+    return sentence.strip().lower().translate(PUNCTUATION_TABLE)
+
 def preprocess_text(text):
-    # Tokenize by splitting on periods (naive approach for sentence splitting)
-    sentences = text.split('.')
+    # Tokenize by splitting on periods (naive approach for sentence splitting),
+    # skip empty sentences and normalize the rest
+    return [normalize_sentence(sentence) for sentence in text.split('.') if sentence.strip()]
+
+# Streaming variant for large files: the file is read in blocks that go through an incremental
+# decoder, and the decoded text is cut at every '.', so memory holds one block plus the
+# unfinished sentence. Splitting after decoding works for any encoding (UTF-16, UTF-32, ...),
+# and a character split across two blocks is completed by the decoder. Yields the same
+# sentences as preprocess_text would for the whole file.
+def stream_sentences(path, encoding="utf-8", block_size=1 << 20):
+    decoder = codecs.getincrementaldecoder(encoding)()
+    pending = ""
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(block_size)
+            pieces = (pending + decoder.decode(block, final=not block)).split(".")
+            pending = pieces.pop()
+            for sentence in pieces:
+                if sentence.strip():
+                    yield normalize_sentence(sentence)
+            if not block:
+                break
+    if pending.strip():
+        yield normalize_sentence(pending)
 
-    # Remove any trailing spaces or empty sentences and normalize to lowercase
-    sentences = [sentence.strip().lower() for sentence in sentences if sentence.strip()]
+def preprocess_file(path, encoding="utf-8"):
+    return list(stream_sentences(path, encoding))
 
-    # Further remove punctuation using string methods
-    normalized_sentences = []
-    for sentence in sentences:
-        # Remove punctuation characters manually
-        sentence = ''.join([char for char in sentence if char.isalnum() or char.isspace()])
-        normalized_sentences.append(sentence)
+# 64-bit content hash of every sentence. Unlike hash() it is the same in every process, so
+# hashes can be stored or compared across workers.
+def sentence_hash(sentence):
+    return int.from_bytes(hashlib.blake2b(sentence.encode("utf-8"), digest_size=8).digest(), "little")
 
-    return normalized_sentences
+def sentence_hashes(doc):
+    return np.fromiter((sentence_hash(sentence) for sentence in doc), dtype=np.uint64, count=len(doc))
 
 # Step 2: Edit Distance (Levenshtein Distance)
+# Myers' bit-parallel algorithm: each column of the DP table is kept as two bit vectors of
+# vertical +1/-1 deltas, so a whole column is updated with a handful of integer operations.
+def bit_parallel_edit_distance(s1, s2):
+    # Use the shorter string as the pattern so the bit vectors stay as narrow as possible
+    if len(s1) > len(s2):
+        s1, s2 = s2, s1
+    m = len(s1)
+    if m == 0:
+        return len(s2)
+
+    # Match masks: bit i is set in peq[c] when s1[i] == c
+    peq = {}
+    for i, char in enumerate(s1):
+        peq[char] = peq.get(char, 0) | (1 << i)
+
+    mask = (1 << m) - 1
+    high_bit = 1 << (m - 1)
+    vp, vn = mask, 0
+    distance = m
+
+    for char in s2:
+        eq = peq.get(char, 0)
+        xv = eq | vn
+        xh = (((eq & vp) + vp) ^ vp) | eq
+        ph = vn | (~(xh | vp) & mask)
+        mh = vp & xh
+        if ph & high_bit:
+            distance += 1
+        elif mh & high_bit:
+            distance -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        vp = mh | (~(xv | ph) & mask)
+        vn = ph & xv
+
+    return distance
+
+# Work counters for benchmarks. Every sentence pair whose distance is asked for counts as a
+# call, however it is answered (identity check, cache or kernel); only pairs that actually go
+# through an edit-distance kernel count as computed.
+edit_distance_counts = {"calls": 0, "computed": 0}
+
+# The same sentence pairs are compared by the heuristic, by every alignment transition and
+# again when detecting plagiarism, so distances are cached per (unordered) pair with LRU eviction
+@lru_cache(maxsize=1 << 16)
+def cached_edit_distance(s1, s2):
+    edit_distance_counts["computed"] += 1
+    return bit_parallel_edit_distance(s1, s2)
+
 def edit_distance(s1, s2):
-    n, m = len(s1), len(s2)
-    dp = [[0] * (m + 1) for _ in range(n + 1)]
-    
-    # Initialize dp table
-    for i in range(n + 1):
-        dp[i][0] = i
-    for j in range(m + 1):
-        dp[0][j] = j
-
-    # Fill dp table
-    for i in range(1, n + 1):
-        for j in range(1, m + 1):
-            if s1[i - 1] == s2[j - 1]:
-                dp[i][j] = dp[i - 1][j - 1]
-            else:
-                dp[i][j] = 1 + min(dp[i - 1][j], dp[i][j - 1], dp[i - 1][j - 1])
-
-    return dp[n][m]
+    edit_distance_counts["calls"] += 1
+    # Identical sentences are the common case in copied text and need no DP at all
+    if s1 == s2:
+        return 0
+    if s1 > s2:
+        s1, s2 = s2, s1
+    return cached_edit_distance(s1, s2)
 
 # Step 3: A* Search Algorithm for Sentence Alignment
-def a_star_alignment(doc1, doc2, skip_penalty=5):
+def a_star_alignment(doc1, doc2, skip_penalty=5, stats=None):
     n, m = len(doc1), len(doc2)
     
     # Priority queue (min-heap) for A* search
     heap = []
-    # State: (total_cost, g(n) - cost so far, i, j, alignment path)
-    heapq.heappush(heap, (0, 0, 0, 0, []))  # Initial state
+    # State: (total_cost, g(n) - cost so far, i, j, push order, alignment path)
+    # The push order breaks ties so paths containing None are never compared
+    push_order = itertools.count()
+    heapq.heappush(heap, (0, 0, 0, 0, next(push_order), []))  # Initial state
     
     # Visited set to track explored states
     visited = set()
+    nodes_expanded = 0
+    peak_open = 1
     
     # Heuristic function: optimistic estimate of remaining alignment cost
     def heuristic(i, j):
@@ -63,16 +147,20 @@ def a_star_alignment(doc1, doc2, skip_penalty=5):
     
     # A* Search loop
     while heap:
-        total_cost, g_cost, i, j, path = heapq.heappop(heap)
+        total_cost, g_cost, i, j, _, path = heapq.heappop(heap)
         
         # Goal state reached (aligned all sentences)
         if i == n and j == m:
+            if stats is not None:
+                stats["nodes_expanded"] = nodes_expanded
+                stats["peak_open"] = peak_open
             return total_cost, path
         
         # Avoid revisiting the same state
         if (i, j) in visited:
             continue
         visited.add((i, j))
+        nodes_expanded += 1
         
         # Transitions (Align current sentences, skip in one or both documents)
         if i < n and j < m:
@@ -81,7 +169,7 @@ def a_star_alignment(doc1, doc2, skip_penalty=5):
             heapq.heappush(heap, (
                 g_cost + align_cost + heuristic(i + 1, j + 1), 
                 g_cost + align_cost, 
-                i + 1, j + 1, 
+                i + 1, j + 1, next(push_order),
                 path + [(i, j)]
             ))
         
@@ -90,7 +178,7 @@ def a_star_alignment(doc1, doc2, skip_penalty=5):
             heapq.heappush(heap, (
                 g_cost + skip_penalty + heuristic(i + 1, j), 
                 g_cost + skip_penalty, 
-                i + 1, j, 
+                i + 1, j, next(push_order),
                 path + [(i, None)]
             ))
         
@@ -99,7 +187,7 @@ def a_star_alignment(doc1, doc2, skip_penalty=5):
             heapq.heappush(heap, (
                 g_cost + skip_penalty + heuristic(i, j + 1), 
                 g_cost + skip_penalty, 
-                i, j + 1, 
+                i, j + 1, next(push_order),
                 path + [(None, j)]
             ))
         
@@ -108,13 +196,152 @@ def a_star_alignment(doc1, doc2, skip_penalty=5):
             heapq.heappush(heap, (
                 g_cost + skip_penalty + heuristic(i + 1, j + 1), 
                 g_cost + skip_penalty, 
-                i + 1, j + 1, 
+                i + 1, j + 1, next(push_order),
                 path + [(None, None)]
             ))
 
+        if len(heap) > peak_open:
+            peak_open = len(heap)
+
     # Return failure if no alignment found
+    if stats is not None:
+        stats["nodes_expanded"] = nodes_expanded
+        stats["peak_open"] = peak_open
     return float('inf'), []
 
+# Step 3b: Dynamic-programming alignment over a precomputed cost matrix
+def encode_sentences(doc, pad):
+    lengths = np.array([len(sentence) for sentence in doc], dtype=np.int64)
+    codes = np.full((len(doc), max(int(lengths.max(initial=0)), 1)), pad, dtype=np.int32)
+    for i, sentence in enumerate(doc):
+        codes[i, :len(sentence)] = [ord(char) for char in sentence]
+    return codes, lengths
+
+# Banded edit distance for many sentence pairs at once. Row i of a pair's DP table is kept only
+# for the 2 * bound + 1 diagonals j - i in [-bound, bound], and all pairs are advanced together
+# with array operations. The left-neighbour dependency inside a row is resolved with a running
+# minimum: row[d] = min_e<=d (t[e] + d - e). Distances above bound are reported as bound + 1.
+# Pairs with equal sentence hashes (checked for collisions) are exact copies and get cost 0
+# without entering the kernel.
+def sentence_cost_matrix(doc1, doc2, bound=None, pairs=None, chunk_size=1 << 15, hashes1=None, hashes2=None):
+    n, m = len(doc1), len(doc2)
+    if n == 0 or m == 0:
+        return np.zeros((n, m), dtype=np.int64)
+    chars1, len1 = encode_sentences(doc1, -1)
+    chars2, len2 = encode_sentences(doc2, -2)
+    if bound is None:
+        bound = int(max(len1.max(), len2.max()))
+    cap = bound + 1
+    costs = np.full((n, m), cap, dtype=np.int64)
+
+    if pairs is None:
+        rows, cols = np.indices((n, m)).reshape(2, -1)
+    else:
+        rows, cols = pairs
+    edit_distance_counts["calls"] += int(rows.size)
+    if hashes1 is None:
+        hashes1 = sentence_hashes(doc1)
+    if hashes2 is None:
+        hashes2 = sentence_hashes(doc2)
+    same = hashes1[rows] == hashes2[cols]
+    for k in np.flatnonzero(same):
+        if doc1[rows[k]] == doc2[cols[k]]:
+            costs[rows[k], cols[k]] = 0
+        else:
+            same[k] = False
+    # The length difference is a lower bound on the distance, so those pairs need no work either
+    todo = ~same & (np.abs(len1[rows] - len2[cols]) <= bound)
+    rows, cols = rows[todo], cols[todo]
+    edit_distance_counts["computed"] += int(rows.size)
+
+    width = 2 * bound + 1
+    offsets = np.arange(-bound, bound + 1, dtype=np.int64)
+    for start in range(0, rows.size, chunk_size):
+        r, c = rows[start:start + chunk_size], cols[start:start + chunk_size]
+        la, lb = len1[r], len2[c]
+        a = chars1[r]
+        # b[j - 1] for row i and diagonal d sits at column i - 1 + d + bound of the padded copy
+        b = np.full((r.size, max(chars1.shape[1], chars2.shape[1]) + width), -2, dtype=np.int32)
+        b[:, bound:bound + chars2.shape[1]] = chars2[c]
+
+        row = np.where((offsets >= 0) & (offsets <= lb[:, None]), offsets, cap)
+        for i in range(1, int(la.max()) + 1):
+            j = i + offsets
+            mismatch = b[:, i - 1:i - 1 + width] != a[:, i - 1][:, None]
+            t = np.minimum(row + mismatch, np.concatenate([row[:, 1:], np.full((r.size, 1), cap)], axis=1) + 1)
+            if i <= bound:
+                t[:, bound - i] = i  # column j = 0
+            new_row = np.minimum.accumulate(t - offsets, axis=1) + offsets
+            new_row = np.where((j >= 0) & (j <= lb[:, None]), np.minimum(new_row, cap), cap)
+            # Pairs whose doc1 sentence is shorter than i are already finished
+            row = np.where((i <= la)[:, None], new_row, row)
+            if (row >= cap).all():
+                break
+        costs[r, c] = row[np.arange(r.size), lb - la + bound]
+    return costs
+
+# Solves the same align / skip recurrence as a_star_alignment exactly. remaining[i][j] is the
+# cheapest cost of aligning doc1[i:] with doc2[j:]; rows are filled bottom-up with array
+# operations and the alignment is read back front to back. With band set, only cells with
+# |i - j| <= band are considered. This is not a drop-in replacement for a_star_alignment:
+# the A* heuristic can overestimate, so on some inputs this finds a cheaper alignment, and
+# when several alignments share the optimal cost the two methods can return different
+# sentence pairs, and therefore a different plagiarism classification.
+def dp_alignment(doc1, doc2, skip_penalty=5, band=None, costs=None):
+    n, m = len(doc1), len(doc2)
+    if band is not None:
+        band = max(band, abs(n - m))
+    if costs is None:
+        # Aligning costs min(distance, skip_penalty), so distances only matter up to skip_penalty
+        pairs = None
+        if band is not None:
+            rows, cols = np.indices((n, m)).reshape(2, -1)
+            inside = np.abs(rows - cols) <= band
+            pairs = (rows[inside], cols[inside])
+        costs = sentence_cost_matrix(doc1, doc2, bound=skip_penalty, pairs=pairs)
+    inf = np.iinfo(np.int64).max // 4
+
+    columns = np.arange(m + 1, dtype=np.int64)
+    remaining = np.empty((n + 1, m + 1), dtype=np.int64)
+    remaining[n] = skip_penalty * (m - columns)
+    for i in range(n - 1, -1, -1):
+        below = remaining[i + 1]
+        candidate = np.empty(m + 1, dtype=np.int64)
+        candidate[:m] = np.minimum(np.minimum(costs[i], skip_penalty) + below[1:], below[:m] + skip_penalty)
+        candidate[m] = below[m] + skip_penalty
+        if band is not None:
+            candidate[np.abs(columns - i) > band] = inf
+        # Skipping sentences of doc2 moves right along the row: take a running minimum from the right
+        shifted = candidate + skip_penalty * columns
+        row = np.minimum.accumulate(shifted[::-1])[::-1] - skip_penalty * columns
+        if band is not None:
+            row[np.abs(columns - i) > band] = inf
+        remaining[i] = row
+    if band is not None:
+        remaining[n][np.abs(columns - n) > band] = inf
+
+    # Walk the table forwards. On ties prefer aligning, then skipping both sentences, then
+    # skipping in doc1, then in doc2. This fixes one optimal alignment; it is not the order in
+    # which a_star_alignment expands states, so its pairs can differ from the A* result.
+    path = []
+    i = j = 0
+    while i < n or j < m:
+        here = remaining[i][j]
+        if i < n and j < m and costs[i][j] + remaining[i + 1][j + 1] == here:
+            path.append((i, j))
+            i, j = i + 1, j + 1
+        elif i < n and j < m and skip_penalty + remaining[i + 1][j + 1] == here:
+            path.append((None, None))
+            i, j = i + 1, j + 1
+        elif i < n and skip_penalty + remaining[i + 1][j] == here:
+            path.append((i, None))
+            i += 1
+        else:
+            path.append((None, j))
+            j += 1
+
+    return int(remaining[0][0]), path
+
 # Step 4: Detect Plagiarism
 def detect_plagiarism(alignment, doc1, doc2, threshold=10):
     plagiarized_pairs = []
@@ -139,13 +366,17 @@ def classify_plagiarism(plagiarized_pairs, total_sentences, threshold=0.5):
         return "No Plagiarism"
 
 # Step 6: Evaluation (Test Cases)
-def evaluate_system(doc1, doc2, threshold=10, skip_penalty=5):
+def evaluate_system(doc1, doc2, threshold=10, skip_penalty=5, method="a_star"):
     # Preprocess the documents
     processed_doc1 = preprocess_text(doc1)
     processed_doc2 = preprocess_text(doc2)
 
-    # Perform A* search for alignment
-    cost, alignment = a_star_alignment(processed_doc1, processed_doc2, skip_penalty)
+    # Perform A* search (or dynamic programming, which finds an optimal cost but can report
+    # different pairs) for alignment
+    if method == "dp":
+        cost, alignment = dp_alignment(processed_doc1, processed_doc2, skip_penalty)
+    else:
+        cost, alignment = a_star_alignment(processed_doc1, processed_doc2, skip_penalty)
     
     # Detect plagiarism based on alignment
     plagiarized_pairs = detect_plagiarism(alignment, processed_doc1, processed_doc2, threshold)
@@ -163,13 +394,14 @@ def evaluate_system(doc1, doc2, threshold=10, skip_penalty=5):
     # Final Classification
     print(f"Plagiarism Classification: {plagiarism_classification}")
 
-# Example Test Case
-doc1 = """
+if __name__ == "__main__":
+    # Example Test Case
+    doc1 = """
 This is the first sentence. This is the second sentence. Another sentence is here.
 """
-doc2 = """
+    doc2 = """
 This is the first sentence. A different second sentence appears here. Another sentence here.
 """
 
-# Step 7: Run evaluation with the example documents
-evaluate_system(doc1, doc2, threshold=10, skip_penalty=5)
+    # Step 7: Run evaluation with the example documents
+    evaluate_system(doc1, doc2, threshold=10, skip_penalty=5)
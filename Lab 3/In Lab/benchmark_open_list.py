@@ -0,0 +1,80 @@
+import heapq
+import time
+from marbe_aStar import MarbleSolitaire
+from marble_bitboard import BitboardSolitaire
+
+# Compares the original heapq open list, which stores (f, node, path) tuples and relies on
+# MarbleSolitaire.__lt__ always returning True, with the bucket-queue A* in marbe_aStar.py
+# and the same search on the bitboard engine in marble_bitboard.py. Symmetry reduction is
+# switched off in both, so all three key their closed sets on the plain board and only the
+# open list and the board representation differ.
+
+class HeapMarbleSolitaire(MarbleSolitaire):
+    def make_move(self, move):
+        return HeapMarbleSolitaire(super().make_move(move).board)
+
+    def __lt__(self, other):
+        return True
+
+def heapq_a_star_search(game):
+    # The previous implementation, instrumented to count expanded nodes
+    open_list = []
+    heapq.heappush(open_list, (game.heuristic(), game, []))
+    visited = set()
+    nodes_expanded = 0
+
+    while open_list:
+        _, node, path = heapq.heappop(open_list)
+
+        if tuple(map(tuple, node.board)) in visited:
+            continue
+
+        visited.add(tuple(map(tuple, node.board)))
+        nodes_expanded += 1
+
+        if node.is_goal():
+            return path, nodes_expanded
+
+        for move in node.get_possible_moves():
+            child_node = node.make_move(move)
+            new_path = path + [move]
+            heapq.heappush(open_list, (len(new_path) + child_node.heuristic(), child_node, new_path))
+
+    return None, nodes_expanded
+
+def run_benchmark():
+    initial_board = [
+        [-1, -1, 1, 1, 1, -1, -1],
+        [-1, -1, 1, 1, 1, -1, -1],
+        [1, 1, 1, 1, 1, 1, 1],
+        [1, 1, 1, 0, 1, 1, 1],
+        [1, 1, 1, 1, 1, 1, 1],
+        [-1, -1, 1, 1, 1, -1, -1],
+        [-1, -1, 1, 1, 1, -1, -1]
+    ]
+
+    start = time.perf_counter()
+    heap_solution, heap_nodes = heapq_a_star_search(HeapMarbleSolitaire(initial_board))
+    heap_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    stats = {}
+    bucket_solution = MarbleSolitaire(initial_board).a_star_search(stats, symmetry=False)
+    bucket_time = time.perf_counter() - start
+    bucket_nodes = stats["nodes_expanded"]
+
+    start = time.perf_counter()
+    bitboard_stats = {}
+    bitboard_solution = BitboardSolitaire.from_board(initial_board).a_star_search(bitboard_stats, symmetry=False)
+    bitboard_time = time.perf_counter() - start
+    bitboard_nodes = bitboard_stats["nodes_expanded"]
+
+    print(f"heapq  : {heap_nodes} nodes in {heap_time:.2f}s ({heap_nodes / heap_time:.0f} nodes/sec), "
+          f"{len(heap_solution)} moves")
+    print(f"bucket : {bucket_nodes} nodes in {bucket_time:.2f}s ({bucket_nodes / bucket_time:.0f} nodes/sec), "
+          f"{len(bucket_solution)} moves, peak open list {stats['peak_open']}")
+    print(f"bitboard: {bitboard_nodes} nodes in {bitboard_time:.3f}s ({bitboard_nodes / bitboard_time:.0f} nodes/sec), "
+          f"{len(bitboard_solution)} moves, peak open list {bitboard_stats['peak_open']}")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,149 @@
+import bisect
+import mmap
+import os
+import zlib
+import numpy as np
+
+# Persistent store of proven-unsolvable Marble Solitaire positions.
+# Canonical bitboard keys are kept on disk as a sorted array of little-endian uint64 and
+# memory-mapped, so a lookup is a binary search that only touches a few pages. A Bloom filter
+# over the stored keys answers most negative lookups without touching the file at all.
+# Positions proven dead during a search are collected in memory and merged into the file by
+# flush(), so the next run on the same geometry starts with everything learned so far.
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+BLOOM_BITS_PER_KEY = 10
+BLOOM_HASHES = 7
+MASK64 = (1 << 64) - 1
+# Odd 64-bit multipliers for double hashing: probe i uses h1 + i * h2
+HASH1 = 0x9E3779B97F4A7C15
+HASH2 = 0xC2B2AE3D27D4EB4F
+
+def store_path(geometry):
+    """One file per board geometry (holes and jumps) and target hole."""
+    signature = repr((geometry.holes, geometry.target, [mask for _, mask, _ in geometry.jumps])).encode()
+    return os.path.join(DATA_DIR, f"dead_{len(geometry.holes)}_{zlib.crc32(signature):08x}.bin")
+
+class DeadPositionStore:
+    """Set-like store of dead canonical keys; pass it as the dead table of pagoda_search."""
+
+    def __init__(self, path):
+        self.path = path
+        self.pending = set()
+        self.file = None
+        self.data = None
+        self.keys = memoryview(b"").cast("Q")
+        self.load()
+
+    @classmethod
+    def for_geometry(cls, geometry):
+        return cls(store_path(geometry))
+
+    def load(self):
+        self.close_file()
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            self.file = open(self.path, "rb")
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.keys = memoryview(self.data).cast("Q")
+        self.build_bloom()
+
+    def build_bloom(self):
+        stored = np.frombuffer(self.data, dtype="<u8") if self.data is not None else np.empty(0, dtype="<u8")
+        self.bloom_size = max(64, len(stored) * BLOOM_BITS_PER_KEY)
+        bloom = np.zeros((self.bloom_size + 7) // 8, dtype=np.uint8)
+        h1 = stored * np.uint64(HASH1)
+        h2 = (stored * np.uint64(HASH2)) | np.uint64(1)
+        for i in range(BLOOM_HASHES):
+            positions = (h1 + np.uint64(i) * h2) % np.uint64(self.bloom_size)
+            np.bitwise_or.at(bloom, positions >> np.uint64(3), np.left_shift(1, positions & np.uint64(7)).astype(np.uint8))
+        self.bloom = bytearray(bloom.tobytes())
+
+    def might_be_stored(self, key):
+        h1 = (key * HASH1) & MASK64
+        h2 = ((key * HASH2) & MASK64) | 1
+        bloom, size = self.bloom, self.bloom_size
+        for i in range(BLOOM_HASHES):
+            position = ((h1 + i * h2) & MASK64) % size
+            if not bloom[position >> 3] >> (position & 7) & 1:
+                return False
+        return True
+
+    def __contains__(self, key):
+        if key in self.pending:
+            return True
+        if not self.might_be_stored(key):
+            return False
+        keys = self.keys
+        index = bisect.bisect_left(keys, key)
+        return index < len(keys) and keys[index] == key
+
+    def add(self, key):
+        self.pending.add(key)
+
+    def __len__(self):
+        return len(self.keys) + len(self.pending)
+
+    def flush(self):
+        """Merge the new keys into the sorted file; readers of the old file are not disturbed."""
+        if not self.pending:
+            return
+        new_keys = np.fromiter(self.pending, dtype=np.uint64, count=len(self.pending))
+        stored = np.frombuffer(self.data, dtype="<u8") if self.data is not None else np.empty(0, dtype="<u8")
+        merged = np.union1d(stored, new_keys).astype("<u8")
+        temporary = self.path + ".tmp"
+        with open(temporary, "wb") as f:
+            f.write(merged.tobytes())
+        del stored
+        self.close_file()
+        os.replace(temporary, self.path)
+        self.pending = set()
+        self.load()
+
+    def close_file(self):
+        self.keys.release()
+        self.keys = memoryview(b"").cast("Q")
+        if self.data is not None:
+            self.data.close()
+            self.data = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def close(self):
+        self.flush()
+        self.close_file()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+if __name__ == "__main__":
+    import random
+    import time
+    from marble_bitboard import ENGLISH, ENGLISH_BOARD, BitboardSolitaire
+
+    # Start configurations: the central game after a few random opening moves
+    rng = random.Random(0)
+    starts = []
+    for _ in range(20):
+        game = BitboardSolitaire.from_board(ENGLISH_BOARD)
+        for _ in range(rng.randint(1, 6)):
+            game = game.make_move(rng.choice(game.get_possible_moves()))
+        starts.append(game)
+
+    for run in ("first", "second"):
+        with DeadPositionStore.for_geometry(ENGLISH) as dead:
+            before = len(dead)
+            nodes = solved = 0
+            start = time.perf_counter()
+            for game in starts:
+                stats = {}
+                if game.pagoda_search(stats, dead) is not None:
+                    solved += 1
+                nodes += stats["nodes_expanded"]
+            elapsed = time.perf_counter() - start
+            print(f"{run} run: {solved}/{len(starts)} solved, {nodes} nodes in {elapsed:.2f}s, "
+                  f"dead positions {before} -> {len(dead)}")
@@ -1,10 +1,17 @@
-import heapq
+import os
+import sys
+# Shared modules live in common/ at the repository root (see common/README.md)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common"))
+from bucket_queue import BucketQueue
+from grid_symmetry import canonical_key, check_board
+from marble_bitboard import BitboardGeometry
 
 class MarbleSolitaire:
-    def __init__(self, board):
+    def __init__(self, board, target=None):
         self.board = board
         self.size = len(board)
-        self.center = (self.size // 2, self.size // 2)  # Center position of the board
+        # The hole the last marble has to end in, the centre unless given
+        self.center = target if target is not None else (self.size // 2, self.size // 2)
 
     def get_possible_moves(self):
         """Find all valid moves (jump over a marble) for the current board state."""
@@ -28,7 +35,7 @@ class MarbleSolitaire:
         new_board[from_x][from_y] = 0
         new_board[to_x][to_y] = 1
         new_board[(from_x + to_x) // 2][(from_y + to_y) // 2] = 0  # Remove jumped-over marble
-        return MarbleSolitaire(new_board)
+        return MarbleSolitaire(new_board, self.center)
 
     def is_goal(self):
         """Check if the goal state is reached: one marble left at the center."""
@@ -38,63 +45,119 @@ class MarbleSolitaire:
         """Heuristic: number of marbles left."""
         return sum(row.count(1) for row in self.board)
 
-    def __lt__(self, other):
-        """Comparison operator for heapq to avoid errors when heuristic values are equal."""
-        return True  # Arbitrarily return True since they can't really be compared directly
-
-    def a_star_search(self):
-        """Perform A* search to solve the Marble Solitaire puzzle."""
-        open_list = []
-        heapq.heappush(open_list, (self.heuristic(), self, []))
+    def canonical_key(self):
+        """Smallest flattened image of the board under the symmetries that fix the target."""
+        return canonical_key(self.board, self.center)
+
+    def flat_key(self):
+        """The flattened board, for searches run without symmetry reduction."""
+        return tuple(cell for row in self.board for cell in row)
+
+    def geometry(self):
+        """Bitboard geometry of the board; its canonical keys index a DeadPositionStore."""
+        return BitboardGeometry(self.board, self.center)
+
+    def a_star_search(self, stats=None, symmetry=True, dead=None):
+        """Perform A* search to solve the Marble Solitaire puzzle.
+
+        With symmetry set, best_g and the closed set are keyed on canonical boards. dead is an
+        optional set of bitboard keys of unsolvable positions (a DeadPositionStore for
+        self.geometry()): children found in it are not queued, and if the search runs out of
+        positions without reaching the goal, every expanded position is added to it.
+        """
+        check_board(self.board, self.center)
+        key = MarbleSolitaire.canonical_key if symmetry else MarbleSolitaire.flat_key
+        if dead is not None:
+            geometry = self.geometry()
+            dead_key = lambda node: geometry.canonical(geometry.encode(node.board))
+            expanded = []
+        open_list = BucketQueue()
+        # Items are (node, move that produced it); g is the number of moves made so far
+        open_list.push((self, None), 0, self.heuristic())
+        start_key = key(self)
+        best_g = {start_key: 0}
         visited = set()
+        nodes_expanded = 0
 
         while open_list:
-            _, node, path = heapq.heappop(open_list)
+            entry = open_list.pop()
+            node, _ = open_list.items[entry]
+            g = open_list.g[entry]
+            board_key = key(node)
 
-            if tuple(map(tuple, node.board)) in visited:
+            if board_key in visited or g > best_g[board_key]:
                 continue
 
-            visited.add(tuple(map(tuple, node.board)))
+            visited.add(board_key)
+            nodes_expanded += 1
+            if dead is not None:
+                expanded.append(dead_key(node))
 
             if node.is_goal():
-                return path
+                if stats is not None:
+                    stats["nodes_expanded"] = nodes_expanded
+                    stats["peak_open"] = open_list.peak_size
+                return [move for _, move in open_list.path(entry)[1:]]
 
             for move in node.get_possible_moves():
                 child_node = node.make_move(move)
-                new_path = path + [move]
-                heapq.heappush(open_list, (len(new_path) + child_node.heuristic(), child_node, new_path))
-
+                child_key = key(child_node)
+                if child_key in visited:
+                    continue
+                if dead is not None and dead_key(child_node) in dead:
+                    continue
+                # Ties are queued too: with symmetric boards merged, keeping only the first
+                # equal-cost image would change the order A* expands its tie-broken frontier
+                if g + 1 <= best_g.get(child_key, float("inf")):
+                    best_g[child_key] = g + 1
+                    open_list.push((child_node, move), g + 1, child_node.heuristic(), entry)
+
+        if dead is not None:
+            # Every queued position was expanded and none led to the goal
+            for bits_key in expanded:
+                dead.add(bits_key)
+        if stats is not None:
+            stats["nodes_expanded"] = nodes_expanded
+            stats["peak_open"] = open_list.peak_size
         return None  # No solution found
 
 
 def print_board(board):
     for row in board:
-        print(" ".join(str(x) for x in row))
+        print(" ".join(" " if x == -1 else str(x) for x in row))
     print()
 
 
-# Example initial board setup (7x7 cross pattern)
-initial_board = [
-    [0, 0, 1, 1, 1, 0, 0],
-    [0, 0, 1, 1, 1, 0, 0],
-    [1, 1, 1, 1, 1, 1, 1],
-    [1, 1, 1, 0, 1, 1, 1],
-    [1, 1, 1, 1, 1, 1, 1],
-    [0, 0, 1, 1, 1, 0, 0],
-    [0, 0, 1, 1, 1, 0, 0]
-]
-
-game = MarbleSolitaire(initial_board)
-solution = game.a_star_search()
-
-if solution:
-    print("Solution found!")
-    current_board = MarbleSolitaire(initial_board)
-    print_board(current_board.board)
-
-    for move in solution:
-        current_board = current_board.make_move(move)
-        print(f"Move: {move}")
+if __name__ == "__main__":
+    # Example initial board setup (7x7 cross pattern, -1 marks cells that are not holes)
+    initial_board = [
+        [-1, -1, 1, 1, 1, -1, -1],
+        [-1, -1, 1, 1, 1, -1, -1],
+        [1, 1, 1, 1, 1, 1, 1],
+        [1, 1, 1, 0, 1, 1, 1],
+        [1, 1, 1, 1, 1, 1, 1],
+        [-1, -1, 1, 1, 1, -1, -1],
+        [-1, -1, 1, 1, 1, -1, -1]
+    ]
+
+    from dead_store import DeadPositionStore
+
+    game = MarbleSolitaire(initial_board)
+    # Positions proven dead by earlier runs (of any solver on this board) are skipped
+    stats = {}
+    with DeadPositionStore.for_geometry(game.geometry()) as dead:
+        solution = game.a_star_search(stats, dead=dead)
+        known_dead = len(dead)
+
+    if solution:
+        print("Solution found!")
+        print(f"Nodes expanded: {stats['nodes_expanded']}, {known_dead} stored dead positions")
+        current_board = MarbleSolitaire(initial_board)
         print_board(current_board.board)
-else:
-    print("No solution found.")
+
+        for move in solution:
+            current_board = current_board.make_move(move)
+            print(f"Move: {move}")
+            print_board(current_board.board)
+    else:
+        print("No solution found.")
@@ -1,10 +1,17 @@
 import heapq
+import os
+import sys
+# Shared modules live in common/ at the repository root (see common/README.md)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common"))
+from grid_symmetry import canonical_key, check_board
+from marble_bitboard import BitboardGeometry
 
 class MarbleSolitaire:
-    def __init__(self, board):
+    def __init__(self, board, target=None):
         self.board = board
         self.size = len(board)
-        self.center = (self.size // 2, self.size // 2)
+        # The hole the last marble has to end in, the centre unless given
+        self.center = target if target is not None else (self.size // 2, self.size // 2)
 
     def get_possible_moves(self):
         moves = []
@@ -24,7 +31,7 @@ class MarbleSolitaire:
         new_board[from_x][from_y] = 0
         new_board[to_x][to_y] = 1
         new_board[(from_x + to_x) // 2][(from_y + to_y) // 2] = 0
-        return MarbleSolitaire(new_board)
+        return MarbleSolitaire(new_board, self.center)
 
     def is_goal(self):
         return sum(row.count(1) for row in self.board) == 1 and self.board[self.center[0]][self.center[1]] == 1
@@ -33,62 +40,114 @@ class MarbleSolitaire:
         """Heuristic: Number of marbles left."""
         return sum(row.count(1) for row in self.board)
 
+    def canonical_key(self):
+        """Smallest flattened image of the board under the symmetries that fix the target."""
+        return canonical_key(self.board, self.center)
+
+    def flat_key(self):
+        """The flattened board, for searches run without symmetry reduction."""
+        return tuple(cell for row in self.board for cell in row)
+
+    def geometry(self):
+        """Bitboard geometry of the board; its canonical keys index a DeadPositionStore."""
+        return BitboardGeometry(self.board, self.center)
+
     def __lt__(self, other):
         """Comparison operator for heapq."""
         return self.heuristic() < other.heuristic()
 
-    def best_first_search(self):
+    def best_first_search(self, stats=None, symmetry=True, dead=None):
+        """Greedy best-first search on marble count; with symmetry set, boards are deduplicated
+        on their canonical key.
+
+        dead is an optional set of bitboard keys of unsolvable positions (a DeadPositionStore for
+        self.geometry()): children found in it are not queued, and if the search runs out of
+        positions without reaching the goal, every position it reached is added to it.
+        """
+        check_board(self.board, self.center)
+        key = MarbleSolitaire.canonical_key if symmetry else MarbleSolitaire.flat_key
+        if dead is not None:
+            geometry = self.geometry()
+            dead_key = lambda node: geometry.canonical(geometry.encode(node.board))
+            reached = [dead_key(self)]
         open_list = []
         heapq.heappush(open_list, (self.heuristic(), self, []))
         visited = set()
-        visited.add(tuple(map(tuple, self.board)))
+        visited.add(key(self))
+        nodes_expanded = 0
 
         while open_list:
             _, node, path = heapq.heappop(open_list)
+            nodes_expanded += 1
 
             if node.is_goal():
+                if stats is not None:
+                    stats["nodes_expanded"] = nodes_expanded
                 return path
 
             for move in node.get_possible_moves():
                 child_node = node.make_move(move)
-                board_tuple = tuple(map(tuple, child_node.board))
-
-                if board_tuple not in visited:
+                board_key = key(child_node)
+
+                if board_key not in visited:
+                    visited.add(board_key)
+                    if dead is not None:
+                        child_dead_key = dead_key(child_node)
+                        if child_dead_key in dead:
+                            continue
+                        reached.append(child_dead_key)
                     new_path = path + [move]
                     heapq.heappush(open_list, (child_node.heuristic(), child_node, new_path))
-                    visited.add(board_tuple)
 
+        if dead is not None:
+            # Every reached position was expanded and none led to the goal
+            for bits_key in reached:
+                dead.add(bits_key)
+        if stats is not None:
+            stats["nodes_expanded"] = nodes_expanded
         return None  # No solution found
 
 
 def print_board(board):
     for row in board:
-        print(" ".join(str(x) for x in row))
+        print(" ".join(" " if x == -1 else str(x) for x in row))
     print()
 
 
-# Try a known solvable board configuration
-initial_board = [
-    [0, 0, 1, 1, 1, 0, 0],
-    [0, 0, 1, 1, 1, 0, 0],
-    [1, 1, 1, 1, 1, 1, 1],
-    [1, 1, 1, 0, 1, 1, 1],
-    [1, 1, 1, 1, 1, 1, 1],
-    [0, 0, 1, 1, 1, 0, 0],
-    [0, 0, 1, 1, 1, 0, 0]
-]
-
-game = MarbleSolitaire(initial_board)
-solution = game.best_first_search()
-
-if solution:
-    print("Best-First Search solution found!")
-    current_board = MarbleSolitaire(initial_board)
-    print_board(current_board.board)
-
-    for move in solution:
-        current_board = current_board.make_move(move)
-        print(f"Move: {move}")
+if __name__ == "__main__":
+    # Try a known solvable board configuration (7x7 cross pattern, -1 marks cells that are not holes)
+    initial_board = [
+        [-1, -1, 1, 1, 1, -1, -1],
+        [-1, -1, 1, 1, 1, -1, -1],
+        [1, 1, 1, 1, 1, 1, 1],
+        [1, 1, 1, 0, 1, 1, 1],
+        [1, 1, 1, 1, 1, 1, 1],
+        [-1, -1, 1, 1, 1, -1, -1],
+        [-1, -1, 1, 1, 1, -1, -1]
+    ]
+
+    from dead_store import DeadPositionStore
+
+    game = MarbleSolitaire(initial_board)
+    plain_stats, symmetry_stats, stats = {}, {}, {}
+    game.best_first_search(plain_stats, symmetry=False)
+    game.best_first_search(symmetry_stats)
+    # Positions proven dead by earlier runs (of any solver on this board) are skipped
+    with DeadPositionStore.for_geometry(game.geometry()) as dead:
+        solution = game.best_first_search(stats, dead=dead)
+        known_dead = len(dead)
+
+    if solution:
+        print("Best-First Search solution found!")
+        print(f"Nodes expanded: {plain_stats['nodes_expanded']} on plain boards, "
+              f"{symmetry_stats['nodes_expanded']} with symmetric boards merged, "
+              f"{stats['nodes_expanded']} when also skipping {known_dead} stored dead positions")
+        current_board = MarbleSolitaire(initial_board)
         print_board(current_board.board)
-else:
-    print("No solution found.")
+
+        for move in solution:
+            current_board = current_board.make_move(move)
+            print(f"Move: {move}")
+            print_board(current_board.board)
+    else:
+        print("No solution found.")
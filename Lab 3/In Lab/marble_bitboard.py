@@ -0,0 +1,519 @@
+import heapq
+import itertools
+import os
+import random
+import sys
+# Shared modules live in common/ at the repository root (see common/README.md)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common"))
+from bucket_queue import BucketQueue
+
+# Bitboard engine for Marble Solitaire.
+# Every hole of the board gets one bit (33 bits for the English cross), so a position is a
+# single integer. All jumps are precomputed as (from, over, to) masks: a jump is legal when
+# bits & (from | over | to) == from | over, and making it is a single XOR with the same mask.
+# Moves are reported as (from_row, from_col, to_row, to_col) like MarbleSolitaire does.
+#
+# A geometry is a grid layout (-1 for cells that are not holes), the jump directions and the
+# target hole, so the same engine handles the English and European boards and the triangular
+# board (drawn as a lower-left triangle, where jumps also run along the main diagonal).
+#
+# Positions that are rotations or reflections of each other have equivalent subtrees, so the
+# searches can dedupe on a canonical key: the smallest integer among all symmetric images of a
+# position. Images are computed with per-symmetry lookup tables over 11-bit chunks of the board.
+# The searches still expand the real positions, so the moves they return are already in the
+# orientation of the start position.
+
+ORTHOGONAL_JUMPS = [(-2, 0), (2, 0), (0, -2), (0, 2)]
+TRIANGULAR_JUMPS = ORTHOGONAL_JUMPS + [(-2, -2), (2, 2)]
+
+CHUNK_BITS = 11
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+# A pagoda function gives every hole a weight such that p(from) + p(over) >= p(to) for every
+# jump, so the total weight of the marbles never increases. A position whose total is below
+# the weight of the target hole can therefore never be solved. All pagoda values of a position
+# are packed into one integer, PAGODA_BITS bits per function and offset so that a field is
+# non-negative exactly when its function is not below the target: a jump updates all of them
+# with one addition and the dead test is a single AND with the fields' top bits.
+PAGODA_BITS = 8
+PAGODA_BIAS = 1 << (PAGODA_BITS - 1)
+
+# Pagoda functions for the English board with the target in the centre (0 outside the board).
+# Their rotations and reflections are added automatically.
+ENGLISH_PAGODAS = [
+    [
+        [ 0,  0, -1,  0, -1,  0,  0],
+        [ 0,  0,  1,  1,  1,  0,  0],
+        [-1,  1,  0,  1,  0,  1, -1],
+        [ 0,  1,  1,  2,  1,  1,  0],
+        [-1,  1,  0,  1,  0,  1, -1],
+        [ 0,  0,  1,  1,  1,  0,  0],
+        [ 0,  0, -1,  0, -1,  0,  0],
+    ],
+    [
+        [ 0,  0,  0,  0,  0,  0,  0],
+        [ 0,  0,  0,  1,  0,  0,  0],
+        [-1,  1,  0,  1,  0,  1, -1],
+        [ 0,  2,  0,  2,  0,  2,  0],
+        [-1,  1,  0,  1,  0,  1, -1],
+        [ 0,  0,  0,  1,  0,  0,  0],
+        [ 0,  0,  0,  0,  0,  0,  0],
+    ],
+    [
+        [ 0,  0, -1,  0, -1,  0,  0],
+        [ 0,  0,  1,  2,  1,  0,  0],
+        [ 0,  0,  0,  0,  0,  0,  0],
+        [ 0,  1,  1,  2,  1,  1,  0],
+        [ 0,  0,  0,  0,  0,  0,  0],
+        [ 0,  0,  1,  2,  1,  0,  0],
+        [ 0,  0, -1,  0, -1,  0,  0],
+    ],
+]
+
+# The 8 symmetries of a rows x cols grid (rotations need a square grid to stay in range)
+GRID_TRANSFORMS = [
+    lambda i, j, rows, cols: (i, j),
+    lambda i, j, rows, cols: (j, rows - 1 - i),
+    lambda i, j, rows, cols: (rows - 1 - i, cols - 1 - j),
+    lambda i, j, rows, cols: (cols - 1 - j, i),
+    lambda i, j, rows, cols: (i, cols - 1 - j),
+    lambda i, j, rows, cols: (rows - 1 - i, j),
+    lambda i, j, rows, cols: (j, i),
+    lambda i, j, rows, cols: (cols - 1 - j, rows - 1 - i),
+]
+
+ENGLISH_BOARD = [
+    [-1, -1, 1, 1, 1, -1, -1],
+    [-1, -1, 1, 1, 1, -1, -1],
+    [1, 1, 1, 1, 1, 1, 1],
+    [1, 1, 1, 0, 1, 1, 1],
+    [1, 1, 1, 1, 1, 1, 1],
+    [-1, -1, 1, 1, 1, -1, -1],
+    [-1, -1, 1, 1, 1, -1, -1]
+]
+
+EUROPEAN_BOARD = [
+    [-1, -1, 1, 1, 1, -1, -1],
+    [-1, 1, 1, 1, 1, 1, -1],
+    [1, 1, 1, 1, 1, 1, 1],
+    [1, 1, 1, 0, 1, 1, 1],
+    [1, 1, 1, 1, 1, 1, 1],
+    [-1, 1, 1, 1, 1, 1, -1],
+    [-1, -1, 1, 1, 1, -1, -1]
+]
+
+TRIANGULAR_BOARD = [
+    [0, -1, -1, -1, -1],
+    [1, 1, -1, -1, -1],
+    [1, 1, 1, -1, -1],
+    [1, 1, 1, 1, -1],
+    [1, 1, 1, 1, 1]
+]
+
+class BitboardGeometry:
+    """Holes and jump masks of a board layout; -1 marks cells that are not holes.
+
+    target is the hole the last marble has to end in (the centre by default) and directions
+    are the (row, col) offsets of a jump.
+    """
+
+    def __init__(self, layout, target=None, directions=ORTHOGONAL_JUMPS, pagodas=()):
+        self.rows = len(layout)
+        self.cols = len(layout[0])
+        self.holes = [(i, j) for i in range(self.rows) for j in range(self.cols) if layout[i][j] != -1]
+        self.bit = {cell: 1 << index for index, cell in enumerate(self.holes)}
+        self.full = (1 << len(self.holes)) - 1
+        if target is None:
+            target = (self.rows // 2, self.cols // 2)
+        if target not in self.bit:
+            raise ValueError(f"target {target} is not a hole of the board")
+        self.target_cell = target
+        self.target = self.bit[target]
+
+        # (need, mask, move): need = from | over must be set, mask also covers the empty target
+        self.jumps = []
+        for i, j in self.holes:
+            for di, dj in directions:
+                over, to = (i + di // 2, j + dj // 2), (i + di, j + dj)
+                if over in self.bit and to in self.bit:
+                    need = self.bit[(i, j)] | self.bit[over]
+                    self.jumps.append((need, need | self.bit[to], (i, j, to[0], to[1])))
+
+        # Symmetries of the board map holes onto holes and jumps onto jumps; the ones that also
+        # keep the target in place are stored as a cell map and as chunk tables that
+        # transform a whole bitboard.
+        moves = {move for _, _, move in self.jumps}
+        board_symmetries = []
+        self.symmetries = []
+        self.symmetry_tables = []
+        for transform in GRID_TRANSFORMS:
+            cell_map = {cell: transform(cell[0], cell[1], self.rows, self.cols) for cell in self.holes}
+            if set(cell_map.values()) != set(self.holes):
+                continue
+            if {cell_map[(a, b)] + cell_map[(c, d)] for a, b, c, d in moves} != moves:
+                continue
+            board_symmetries.append(cell_map)
+            if cell_map[target] != target:
+                continue
+            self.symmetries.append(cell_map)
+            if all(cell_map[cell] == cell for cell in self.holes):
+                continue  # the identity needs no table
+            images = [self.bit[cell_map[cell]] for cell in self.holes]
+            tables = []
+            for start in range(0, len(images), CHUNK_BITS):
+                chunk = images[start:start + CHUNK_BITS]
+                table = [0] * (1 << len(chunk))
+                for value in range(1, len(table)):
+                    lowest = value & -value
+                    table[value] = table[value ^ lowest] | chunk[lowest.bit_length() - 1]
+                tables.append(table)
+            self.symmetry_tables.append(tables)
+
+        # The parity class of the target (holes an even number of rows and columns away from
+        # it) is a pagoda function on every board; symmetric images of the given ones are added
+        weights = [{cell: 1 if (cell[0] - target[0]) % 2 == 0 and (cell[1] - target[1]) % 2 == 0 else 0
+                    for cell in self.holes}]
+        for grid in pagodas:
+            for cell_map in board_symmetries:
+                weights.append({cell_map[cell]: grid[cell[0]][cell[1]] for cell in self.holes})
+        self.pagodas = []
+        for weight in weights:
+            if weight not in self.pagodas:
+                if not self.is_pagoda(weight):
+                    raise ValueError("not a pagoda function for this board")
+                self.pagodas.append(weight)
+        self.pagoda_alive = sum(PAGODA_BIAS << (k * PAGODA_BITS) for k in range(len(self.pagodas)))
+        self.pagoda_deltas = []
+        for _, _, move in self.jumps:
+            from_cell, to_cell = (move[0], move[1]), (move[2], move[3])
+            over = ((move[0] + move[2]) // 2, (move[1] + move[3]) // 2)
+            self.pagoda_deltas.append(sum(
+                (weight[to_cell] - weight[from_cell] - weight[over]) << (k * PAGODA_BITS)
+                for k, weight in enumerate(self.pagodas)))
+
+    def encode(self, board):
+        bits = 0
+        for cell, bit in self.bit.items():
+            if board[cell[0]][cell[1]] == 1:
+                bits |= bit
+        return bits
+
+    def decode(self, bits):
+        board = [[-1] * self.cols for _ in range(self.rows)]
+        for (i, j), bit in self.bit.items():
+            board[i][j] = 1 if bits & bit else 0
+        return board
+
+    def legal_jumps(self, bits):
+        return [jump for jump in self.jumps if bits & jump[1] == jump[0]]
+
+    def is_pagoda(self, weight):
+        for _, _, move in self.jumps:
+            over = ((move[0] + move[2]) // 2, (move[1] + move[3]) // 2)
+            if weight[(move[0], move[1])] + weight[over] < weight[(move[2], move[3])]:
+                return False
+        return True
+
+    def pagoda_value(self, bits):
+        """Packed pagoda values of a position; see PAGODA_BITS."""
+        value = 0
+        for k, weight in enumerate(self.pagodas):
+            total = sum(weight[cell] for cell, bit in self.bit.items() if bits & bit)
+            target = sum(weight[cell] for cell, bit in self.bit.items() if self.target & bit)
+            value += (total - target + PAGODA_BIAS) << (k * PAGODA_BITS)
+        return value
+
+    def canonical(self, bits):
+        """Smallest bitboard among all symmetric images of bits."""
+        best = bits
+        for tables in self.symmetry_tables:
+            image = 0
+            rest = bits
+            for table in tables:
+                image |= table[rest & CHUNK_MASK]
+                rest >>= CHUNK_BITS
+            if image < best:
+                best = image
+        return best
+
+ENGLISH = BitboardGeometry(ENGLISH_BOARD, pagodas=ENGLISH_PAGODAS)
+
+# Layout, jump directions and extra pagoda functions of the built-in boards
+GEOMETRIES = {
+    "english": (ENGLISH_BOARD, ORTHOGONAL_JUMPS, ENGLISH_PAGODAS),
+    "european": (EUROPEAN_BOARD, ORTHOGONAL_JUMPS, ()),
+    "triangular": (TRIANGULAR_BOARD, TRIANGULAR_JUMPS, ()),
+}
+
+def make_geometry(name, target=None):
+    """Geometry of a built-in board with any target hole."""
+    layout, directions, pagodas = GEOMETRIES[name]
+    if name == "english" and target is None:
+        return ENGLISH
+    return BitboardGeometry(layout, target, directions, pagodas)
+
+class SearchCancelled(Exception):
+    pass
+
+class BitboardSolitaire:
+    def __init__(self, bits, geometry=ENGLISH):
+        self.bits = bits
+        self.geometry = geometry
+
+    @classmethod
+    def from_board(cls, board, geometry=None):
+        """Build from a MarbleSolitaire-style grid; the geometry is derived from it by default."""
+        if geometry is None:
+            holes = [(i, j) for i, row in enumerate(board) for j, cell in enumerate(row) if cell != -1]
+            geometry = ENGLISH if holes == ENGLISH.holes else BitboardGeometry(board)
+        return cls(geometry.encode(board), geometry)
+
+    @property
+    def board(self):
+        return self.geometry.decode(self.bits)
+
+    def get_possible_moves(self):
+        return [move for _, _, move in self.geometry.legal_jumps(self.bits)]
+
+    def make_move(self, move):
+        from_x, from_y, to_x, to_y = move
+        bit = self.geometry.bit
+        over = bit[((from_x + to_x) // 2, (from_y + to_y) // 2)]
+        return BitboardSolitaire(self.bits ^ bit[(from_x, from_y)] ^ over ^ bit[(to_x, to_y)], self.geometry)
+
+    def is_goal(self):
+        return self.bits == self.geometry.target
+
+    def heuristic(self):
+        """Heuristic: number of marbles left."""
+        return bin(self.bits).count("1")
+
+    def best_first_search(self, stats=None, symmetry=True, dead=None):
+        """Greedy best-first search on marble count, expanding jumps straight from the masks.
+
+        With symmetry set, positions are deduplicated on their canonical key. Children whose
+        canonical key is in dead (see pagoda_search) are not queued. If the search runs out of
+        positions without reaching the target, every position it reached is added to dead.
+        """
+        jumps = self.geometry.jumps
+        target = self.geometry.target
+        canonical = self.geometry.canonical
+        key = canonical if symmetry else int
+        push_order = itertools.count()
+        # Entries are (marbles, push order, bits, path); parent links keep paths shared
+        open_list = [(self.heuristic(), next(push_order), self.bits, None)]
+        visited = {key(self.bits)}
+        nodes_expanded = 0
+        peak_open = 1
+
+        while open_list:
+            _, _, bits, path = heapq.heappop(open_list)
+            nodes_expanded += 1
+
+            if bits == target:
+                if stats is not None:
+                    stats["nodes_expanded"] = nodes_expanded
+                    stats["peak_open"] = peak_open
+                return unwind(path)
+
+            for need, mask, move in jumps:
+                if bits & mask == need:
+                    child = bits ^ mask
+                    child_key = key(child)
+                    if child_key not in visited:
+                        visited.add(child_key)
+                        if dead is not None and canonical(child) in dead:
+                            continue
+                        heapq.heappush(open_list, (bin(child).count("1"), next(push_order), child, (move, path)))
+            if len(open_list) > peak_open:
+                peak_open = len(open_list)
+
+        if dead is not None:
+            # Every reached position was expanded and none led to the target
+            for bits_key in visited:
+                dead.add(bits_key if symmetry else canonical(bits_key))
+        if stats is not None:
+            stats["nodes_expanded"] = nodes_expanded
+            stats["peak_open"] = peak_open
+        return None  # No solution found
+
+    def a_star_search(self, stats=None, symmetry=True, dead=None):
+        """A* over bitboards with g = moves made and h = marbles left.
+
+        With symmetry set, best_g and the closed set are keyed on canonical positions.
+        Children whose canonical key is in dead are not queued. If the search runs out of
+        positions without reaching the target, every expanded position is added to dead.
+        """
+        jumps = self.geometry.jumps
+        target = self.geometry.target
+        canonical = self.geometry.canonical
+        key = canonical if symmetry else int
+        open_list = BucketQueue()
+        # Items are (bits, move that produced it)
+        open_list.push((self.bits, None), 0, self.heuristic())
+        best_g = {key(self.bits): 0}
+        visited = set()
+        nodes_expanded = 0
+
+        while open_list:
+            entry = open_list.pop()
+            bits, _ = open_list.items[entry]
+            g = open_list.g[entry]
+            bits_key = key(bits)
+
+            if bits_key in visited or g > best_g[bits_key]:
+                continue
+
+            visited.add(bits_key)
+            nodes_expanded += 1
+
+            if bits == target:
+                if stats is not None:
+                    stats["nodes_expanded"] = nodes_expanded
+                    stats["peak_open"] = open_list.peak_size
+                return [move for _, move in open_list.path(entry)[1:]]
+
+            for need, mask, move in jumps:
+                if bits & mask == need:
+                    child = bits ^ mask
+                    child_key = key(child)
+                    if child_key in visited:
+                        continue
+                    if dead is not None and canonical(child) in dead:
+                        continue
+                    # Ties are queued too, so of several symmetric siblings the one that would be
+                    # expanded first without symmetry reduction still is; the rest are closed
+                    if g + 1 <= best_g.get(child_key, float("inf")):
+                        best_g[child_key] = g + 1
+                        open_list.push((child, move), g + 1, bin(child).count("1"), entry)
+
+        if dead is not None:
+            # Every queued position was expanded and none led to the target
+            for bits_key in visited:
+                dead.add(bits_key if symmetry else canonical(bits_key))
+        if stats is not None:
+            stats["nodes_expanded"] = nodes_expanded
+            stats["peak_open"] = open_list.peak_size
+        return None  # No solution found
+
+    def pagoda_search(self, stats=None, dead=None, cancel=None):
+        """Depth-first search pruned by pagoda functions and a table of dead positions.
+
+        dead is a set of canonical keys of positions known to be unsolvable; it is filled in
+        as subtrees fail and can be shared between runs on the same geometry (a
+        DeadPositionStore keeps it on disk). cancel is an optional event: once it is set the
+        search gives up and returns None. Only fully explored subtrees are ever marked dead.
+        """
+        geometry = self.geometry
+        jumps = [(need, mask, move, delta)
+                 for (need, mask, move), delta in zip(geometry.jumps, geometry.pagoda_deltas)]
+        target = geometry.target
+        alive = geometry.pagoda_alive
+        canonical = geometry.canonical
+        if dead is None:
+            dead = set()
+        moves = []
+        nodes_expanded = pruned = dead_hits = 0
+
+        def search(bits, value):
+            nonlocal nodes_expanded, pruned, dead_hits
+            if bits == target:
+                return True
+            key = canonical(bits)
+            if key in dead:
+                dead_hits += 1
+                return False
+            nodes_expanded += 1
+            if cancel is not None and nodes_expanded & 4095 == 0 and cancel.is_set():
+                raise SearchCancelled
+            for need, mask, move, delta in jumps:
+                if bits & mask == need:
+                    child_value = value + delta
+                    if child_value & alive != alive:
+                        pruned += 1
+                        continue
+                    moves.append(move)
+                    if search(bits ^ mask, child_value):
+                        return True
+                    moves.pop()
+            dead.add(key)
+            return False
+
+        value = geometry.pagoda_value(self.bits)
+        cancelled = False
+        try:
+            solved = value & alive == alive and search(self.bits, value)
+        except SearchCancelled:
+            solved, cancelled = False, True
+        if stats is not None:
+            stats["nodes_expanded"] = nodes_expanded
+            stats["pruned"] = pruned
+            stats["dead_hits"] = dead_hits
+            stats["dead_positions"] = len(dead)
+            stats["cancelled"] = cancelled
+        return moves if solved else None
+
+def unwind(path):
+    # Paths are linked lists (move, parent path) ending in None
+    moves = []
+    while path is not None:
+        move, path = path
+        moves.append(move)
+    moves.reverse()
+    return moves
+
+def reverse_scramble(geometry, num_moves, seed=0):
+    """A start position with num_moves + 1 marbles that is known to be solvable.
+
+    Jumps are played backwards from a single marble on the target: a marble is pulled back
+    over an empty hole into another empty hole, filling both.
+    """
+    rng = random.Random(seed)
+    bits = geometry.target
+    for _ in range(num_moves):
+        # Backwards, "to" must hold a marble while "from" and "over" are empty
+        options = [mask for need, mask, _ in geometry.jumps if bits & mask == mask ^ need]
+        if not options:
+            break
+        bits ^= rng.choice(options)
+    return bits
+
+def print_board(board):
+    for row in board:
+        print(" ".join(" " if x == -1 else str(x) for x in row))
+    print()
+
+
+if __name__ == "__main__":
+    import time
+
+    game = BitboardSolitaire.from_board(ENGLISH_BOARD)
+    for name, search in [("Best-first", game.best_first_search), ("A*", game.a_star_search)]:
+        for symmetry in (False, True):
+            stats = {}
+            start = time.perf_counter()
+            solution = search(stats, symmetry)
+            elapsed = time.perf_counter() - start
+            label = f"{name} ({'symmetry-reduced' if symmetry else 'plain'})"
+            if solution:
+                print(f"{label} solution found: {len(solution)} moves, {stats['nodes_expanded']} nodes "
+                      f"in {elapsed:.2f}s ({stats['nodes_expanded'] / max(elapsed, 1e-9):.0f} nodes/sec)")
+            else:
+                print(f"{label}: no solution found.")
+
+    stats = {}
+    start = time.perf_counter()
+    solution = game.pagoda_search(stats)
+    elapsed = time.perf_counter() - start
+    if solution is None:
+        print(f"Pagoda DFS: no solution found ({stats['nodes_expanded']} nodes in {elapsed:.2f}s).")
+    else:
+        print(f"Pagoda DFS solution found: {len(solution)} moves, {stats['nodes_expanded']} nodes, "
+              f"{stats['pruned']} pruned by pagoda functions, {stats['dead_hits']} dead-table hits in {elapsed:.2f}s")
+
+        current = game
+        print_board(current.board)
+        for move in solution:
+            current = current.make_move(move)
+            print(f"Move: {move}")
+            print_board(current.board)
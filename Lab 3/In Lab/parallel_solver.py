@@ -0,0 +1,174 @@
+import multiprocessing
+from multiprocessing import Pool
+from dead_store import DeadPositionStore, store_path
+from marble_bitboard import BitboardSolitaire
+
+# Parallel root-split solver for Marble Solitaire.
+# The search tree is expanded breadth-first down to split_depth (deduplicated on canonical
+# keys and pruned by the pagoda functions), and every position on that frontier becomes one
+# pagoda_search task in a process pool. Every worker memory-maps the on-disk dead-position
+# store as it was when the pool started; positions proven dead during the run are appended in
+# batches to a log held by a multiprocessing Manager, and each worker pulls the entries the
+# others have added every few thousand lookups, so a subtree one worker refutes is pruned by
+# the rest within the same run. The parent merges the log into the store for later runs. The
+# first worker to find a solution sets a shared event, which makes all running searches give
+# up and the queued tasks return at once.
+
+worker = {}
+
+class SharedDeadSet:
+    """A worker's view of the dead positions: its own store plus everything the pool has logged."""
+
+    def __init__(self, store, log, sync_interval=4096, batch_size=256):
+        self.store = store
+        self.log = log
+        self.sync_interval = sync_interval
+        self.batch_size = batch_size
+        self.seen = 0  # log entries already merged into the store
+        self.outbox = []
+        self.lookups = 0
+
+    def __contains__(self, key):
+        self.lookups += 1
+        if self.lookups % self.sync_interval == 0:
+            self.sync()
+        return key in self.store
+
+    def add(self, key):
+        self.store.add(key)
+        self.outbox.append(key)
+        if len(self.outbox) >= self.batch_size:
+            self.publish()
+
+    def __len__(self):
+        return len(self.store)
+
+    def publish(self):
+        if self.outbox:
+            self.log.extend(self.outbox)
+            self.outbox = []
+
+    def sync(self):
+        self.publish()
+        new_keys = self.log[self.seen:]
+        self.seen += len(new_keys)
+        self.store.pending.update(new_keys)
+
+def init_worker(geometry, dead_path, dead_log, cancel):
+    worker["geometry"] = geometry
+    worker["dead"] = SharedDeadSet(DeadPositionStore(dead_path), dead_log)
+    worker["cancel"] = cancel
+
+def solve_subtree(task):
+    """Run one frontier task; returns (full move list or None, stats)."""
+    prefix, bits = task
+    stats = {}
+    if worker["cancel"].is_set():
+        return None, stats
+    dead = worker["dead"]
+    # Start from everything the other workers have proven so far
+    dead.sync()
+    moves = BitboardSolitaire(bits, worker["geometry"]).pagoda_search(stats, dead, worker["cancel"])
+    if moves is not None:
+        worker["cancel"].set()
+    dead.publish()
+    return (prefix + moves if moves is not None else None), stats
+
+def split_tasks(game, split_depth, dead=()):
+    """Frontier positions split_depth moves below game as (moves from game, bits) pairs."""
+    geometry = game.geometry
+    alive = geometry.pagoda_alive
+    layer = [([], game.bits, geometry.pagoda_value(game.bits))]
+    seen = {geometry.canonical(game.bits)}
+    for _ in range(split_depth):
+        next_layer = []
+        for prefix, bits, value in layer:
+            if bits == geometry.target:
+                return [(prefix, bits)]
+            for (need, mask, move), delta in zip(geometry.jumps, geometry.pagoda_deltas):
+                if bits & mask == need:
+                    child, child_value = bits ^ mask, value + delta
+                    if child_value & alive != alive:
+                        continue
+                    key = geometry.canonical(child)
+                    if key in seen or key in dead:
+                        continue
+                    seen.add(key)
+                    next_layer.append((prefix + [move], child, child_value))
+        if not next_layer:
+            break
+        layer = next_layer
+    return [(prefix, bits) for prefix, bits, _ in layer]
+
+def parallel_search(game, split_depth=4, processes=None, dead_path=None, stats=None):
+    """Solve game across a process pool; returns the list of moves or None.
+
+    Workers start from the dead-position store as it was when the pool started and share the
+    positions they prove dead through a Manager-held log while the run goes on; the parent
+    merges the log into the store at the end.
+    """
+    geometry = game.geometry
+    if dead_path is None:
+        dead_path = store_path(geometry)
+    solution = None
+    nodes_expanded = pruned = 0
+
+    with DeadPositionStore(dead_path) as dead:
+        tasks = split_tasks(game, split_depth, dead)
+        for prefix, bits in tasks:
+            if bits == geometry.target:
+                solution = prefix
+        if solution is None and tasks:
+            # Workers map the store file as it is now, so write out what is already known
+            dead.flush()
+            cancel = multiprocessing.Event()
+            with multiprocessing.Manager() as manager:
+                dead_log = manager.list()
+                with Pool(processes, initializer=init_worker,
+                          initargs=(geometry, dead_path, dead_log, cancel)) as pool:
+                    for moves, task_stats in pool.imap_unordered(solve_subtree, tasks):
+                        nodes_expanded += task_stats.get("nodes_expanded", 0)
+                        pruned += task_stats.get("pruned", 0)
+                        if moves is not None and solution is None:
+                            solution = moves
+                            cancel.set()
+                # Every task publishes its keys before returning, so the log is complete here
+                for key in dead_log[:]:
+                    dead.add(key)
+        if stats is not None:
+            stats["tasks"] = len(tasks)
+            stats["nodes_expanded"] = nodes_expanded
+            stats["pruned"] = pruned
+            stats["dead_positions"] = len(dead)
+    return solution
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+    from marble_bitboard import ENGLISH_BOARD, TRIANGULAR_BOARD, make_geometry, reverse_scramble
+
+    directory = tempfile.mkdtemp()
+    triangular = make_geometry("triangular", target=(0, 0))
+    european = make_geometry("european", target=(0, 3))
+    # reverse_scramble stops early when no reverse move is left, so count what it produced
+    scrambled = reverse_scramble(european, 33, seed=3)
+    games = [
+        ("English, central game", BitboardSolitaire.from_board(ENGLISH_BOARD)),
+        ("Triangular, top hole", BitboardSolitaire(triangular.encode(TRIANGULAR_BOARD), triangular)),
+        (f"European, {bin(scrambled).count('1')} marbles", BitboardSolitaire(scrambled, european)),
+    ]
+
+    for name, game in games:
+        for label in ("single process", "process pool"):
+            path = os.path.join(directory, f"{label}-{name}.bin")
+            stats = {}
+            start = time.perf_counter()
+            if label == "single process":
+                with DeadPositionStore(path) as dead:
+                    solution = game.pagoda_search(stats, dead)
+            else:
+                solution = parallel_search(game, dead_path=path, stats=stats)
+            elapsed = time.perf_counter() - start
+            result = f"{len(solution)} moves" if solution is not None else "no solution"
+            print(f"{name} ({label}): {result}, {stats['nodes_expanded']} nodes in {elapsed:.2f}s")
@@ -5,11 +5,28 @@
 # You can experiment with various m (number of clauses) and n (number of variables) to observe how the algorithms perform. The code is designed for small-scale problems, and you can scale it up for larger instances of 3-SAT by adjusting the parameters.
 
 import random
+import time
 import numpy as np
+from dimacs import to_matrix, iter_clauses as flat_clauses
 
 # Part A: Random k-SAT Problem Generator
 
-def create_k_sat_problem(n, k, m):
+# With flat=True the formula is generated with NumPy straight into the flat (literals, offsets)
+# format of dimacs.py instead of lists of strings, which is what large instances need.
+def create_k_sat_problem(n, k, m, flat=False):
+    if flat:
+        if 2 * k > n:
+            variables = np.argsort(np.random.rand(m, n), axis=1)[:, :k] + 1
+        else:
+            variables = np.random.randint(1, n + 1, size=(m, k))
+            # Redraw the clauses that picked a variable twice
+            repeated = (np.diff(np.sort(variables, axis=1), axis=1) == 0).any(axis=1)
+            while repeated.any():
+                variables[repeated] = np.random.randint(1, n + 1, size=(int(repeated.sum()), k))
+                repeated = (np.diff(np.sort(variables, axis=1), axis=1) == 0).any(axis=1)
+        signs = np.where(np.random.rand(m, k) < 0.5, -1, 1)
+        return (variables * signs).astype(np.int32).ravel(), np.arange(0, m * k + 1, k, dtype=np.int64)
+
     # Generate variable names as x1, x2, ..., xn
     variables = [f'x{i}' for i in range(1, n+1)]
     clauses = []
@@ -23,26 +40,41 @@ def create_k_sat_problem(n, k, m):
     
     return clauses
 
-# Example usage
-n = 5  # Number of variables
-k = 3  # Length of each clause
-m = 4  # Number of clauses
+# Part B: 3-SAT Problem
 
-problem = create_k_sat_problem(n, k, m)
-for clause in problem:
-    print(' OR '.join(clause))
+# Clauses are converted once into an (m x k) int32 matrix of signed 1-based variable indices
+# ('x3' -> 3, '-x3' -> -3). Formulas that are already encoded are returned unchanged, and flat
+# (literals, offsets) formulas from dimacs.py are reshaped into the same matrix.
+def encode_problem(problem):
+    if isinstance(problem, np.ndarray):
+        return problem
+    if isinstance(problem, tuple):
+        return to_matrix(problem)
+    encoded = [[-int(literal[2:]) if literal[0] == '-' else int(literal[1:]) for literal in clause]
+               for clause in problem]
+    if not encoded:
+        return np.zeros((0, 0), dtype=np.int32)
+    return np.array(encoded, dtype=np.int32)
 
+# Clauses one at a time as lists of signed literals. Flat (literals, offsets) formulas are read
+# block by block instead of being padded into the matrix first.
+def iter_clauses(problem):
+    if isinstance(problem, tuple):
+        return flat_clauses(problem)
+    return iter(encode_problem(problem).tolist())
 
-# Part B: 3-SAT Problem
+def num_clauses(problem):
+    return len(problem[1]) - 1 if isinstance(problem, tuple) else len(problem)
 
-# Evaluates the number of satisfied clauses for a given assignment
+# Truth value of every literal: (m x k) for one assignment, (s x m x k) for a stack of s
+def literal_values(clauses, assignment):
+    assignment = np.asarray(assignment, dtype=bool)
+    return assignment[..., np.abs(clauses) - 1] != (clauses < 0)
+
+# Evaluates the number of satisfied clauses for a given assignment (or a stack of assignments)
 def evaluate_clauses(problem, assignment):
-    satisfied_count = 0
-    for clause in problem:
-        if any((literal[0] == '-' and not assignment[int(literal[2:])-1]) or
-               (literal[0] != '-' and assignment[int(literal[1:])-1]) for literal in clause):
-            satisfied_count += 1
-    return satisfied_count
+    counts = literal_values(encode_problem(problem), assignment).any(axis=-1).sum(axis=-1)
+    return int(counts) if counts.ndim == 0 else counts
 
 # Heuristic 1: number of satisfied clauses
 def heuristic_1(problem, assignment):
@@ -50,102 +82,357 @@ def heuristic_1(problem, assignment):
 
 # Heuristic 2: sum of satisfied literals per clause
 def heuristic_2(problem, assignment):
-    score = 0
-    for clause in problem:
-        score += sum((literal[0] == '-' and not assignment[int(literal[2:])-1]) or
-                     (literal[0] != '-' and assignment[int(literal[1:])-1]) for literal in clause)
-    return score
+    scores = literal_values(encode_problem(problem), assignment).sum(axis=(-2, -1))
+    return int(scores) if scores.ndim == 0 else scores
 
-def hill_climbing(problem, n, heuristic):
-    assignment = np.random.choice([True, False], size=n)
-    best_score = heuristic(problem, assignment)
-    
-    while True:
-        neighbor_found = False
-        
-        for i in range(n):
-            # Flip the value of the i-th variable
-            new_assignment = assignment.copy()
-            new_assignment[i] = not new_assignment[i]
-            
-            new_score = heuristic(problem, new_assignment)
-            
-            if new_score > best_score:
-                assignment = new_assignment
-                best_score = new_score
-                neighbor_found = True
-                break
-        
-        # If no better neighbor was found, return the best assignment found so far
-        if not neighbor_found:
-            break
-    
-    return assignment, best_score
+# Incremental scoring for single-variable flips.
+# Every clause keeps its number of true literals and every variable the clauses it occurs in
+# (positively and negatively, with multiplicity), so the change in score caused by a flip is
+# computed from that variable's occurrences only, and a flip updates the counts in place.
+class FlipState:
+    def __init__(self, problem, n, assignment):
+        self.problem = problem
+        self.n = n
+        self.assignment = [bool(value) for value in assignment]
+        # (clause, multiplicity, true count at which a flip breaks the clause) triples
+        self.positive = [[] for _ in range(n)]
+        self.negative = [[] for _ in range(n)]
+        self.true_count = []
+        for index, clause in enumerate(iter_clauses(problem)):
+            multiplicity = {}
+            for literal in clause:
+                multiplicity[literal] = multiplicity.get(literal, 0) + 1
+            true_literals = 0
+            for literal, count in multiplicity.items():
+                variable = abs(literal) - 1
+                # A clause with both x and -x stays satisfied whatever x is flipped to
+                break_at = -1 if -literal in multiplicity else count
+                (self.positive if literal > 0 else self.negative)[variable].append((index, count, break_at))
+                if self.assignment[variable] == (literal > 0):
+                    true_literals += count
+            self.true_count.append(true_literals)
+        self.satisfied = sum(1 for count in self.true_count if count)
+        self.true_literals = sum(self.true_count)
+
+    def occurrences(self, variable):
+        """(occurrences that are true now, occurrences that are false now)."""
+        if self.assignment[variable]:
+            return self.positive[variable], self.negative[variable]
+        return self.negative[variable], self.positive[variable]
+
+    def break_count(self, variable):
+        true_count = self.true_count
+        return sum(1 for clause, _, break_at in self.occurrences(variable)[0] if true_count[clause] == break_at)
+
+    def make_count(self, variable):
+        true_count = self.true_count
+        return sum(1 for clause, _, _ in self.occurrences(variable)[1] if true_count[clause] == 0)
+
+    def score(self, heuristic):
+        if heuristic is heuristic_1:
+            return self.satisfied
+        if heuristic is heuristic_2:
+            return self.true_literals
+        return heuristic(self.problem, np.array(self.assignment))
+
+    def delta(self, variable, heuristic):
+        """Change in heuristic if variable were flipped."""
+        if heuristic is heuristic_1:
+            return self.make_count(variable) - self.break_count(variable)
+        if heuristic is heuristic_2:
+            now_true, now_false = self.occurrences(variable)
+            return sum(count for _, count, _ in now_false) - sum(count for _, count, _ in now_true)
+        # Any other heuristic is rescored from scratch
+        if not isinstance(self.problem, np.ndarray):
+            self.problem = encode_problem(self.problem)
+        assignment = np.array(self.assignment)
+        before = heuristic(self.problem, assignment)
+        assignment[variable] = not assignment[variable]
+        return heuristic(self.problem, assignment) - before
+
+    def flip(self, variable):
+        true_count = self.true_count
+        now_true, now_false = self.occurrences(variable)
+        # Add before subtracting so that x OR -x never looks unsatisfied on the way
+        for clause, count, _ in now_false:
+            if true_count[clause] == 0:
+                self.satisfied += 1
+            true_count[clause] += count
+            self.true_literals += count
+        for clause, count, _ in now_true:
+            true_count[clause] -= count
+            if true_count[clause] == 0:
+                self.satisfied -= 1
+            self.true_literals -= count
+        self.assignment[variable] = not self.assignment[variable]
+
+# First-improvement hill climbing. Variables are scanned cyclically, continuing after the last
+# accepted flip, until a full pass over all n variables finds no improving flip.
+def hill_climbing(problem, n, heuristic, stats=None):
+    state = FlipState(problem, n, np.random.choice([True, False], size=n))
+    variable = 0
+    since_improvement = 0
+    flips = evaluations = 0
+    while since_improvement < n:
+        evaluations += 1
+        if state.delta(variable, heuristic) > 0:
+            state.flip(variable)
+            flips += 1
+            since_improvement = 0
+        else:
+            since_improvement += 1
+        variable = variable + 1 if variable + 1 < n else 0
+
+    if stats is not None:
+        stats["flips"] = flips
+        stats["evaluations"] = evaluations
+    return np.array(state.assignment), state.score(heuristic)
+
+# Scores a stack of assignments in chunks so the (rows x m x k) literal table stays small
+def score_stack(problem, heuristic, assignments, max_cells=1 << 24):
+    chunk = max(1, max_cells // max(1, problem.size))
+    if len(assignments) <= chunk:
+        return np.asarray(heuristic(problem, assignments))
+    return np.concatenate([np.asarray(heuristic(problem, assignments[start:start + chunk]))
+                           for start in range(0, len(assignments), chunk)])
 
-def beam_search(problem, n, beam_width, heuristic):
+# Beam search over single-variable flips. The whole neighbourhood of the beam is built as one
+# (beam_width * n) x n boolean matrix and scored in one vectorized pass; duplicate assignments
+# are dropped by their packed bits and the next beam is taken with argpartition. The search
+# stops on a satisfying assignment, after max_iterations, or when the best score has not
+# improved for patience iterations, and returns the best assignment seen.
+def beam_search(problem, n, beam_width, heuristic, max_iterations=1000, patience=20, stats=None):
+    problem = encode_problem(problem)
+    m = len(problem)
     # Initialize the beam with random assignments
-    beam = [np.random.choice([True, False], size=n) for _ in range(beam_width)]
-    
-    while True:
-        new_beam = []
-        for assignment in beam:
-            for i in range(n):
-                # Flip each variable and create new assignments
-                new_assignment = assignment.copy()
-                new_assignment[i] = not new_assignment[i]
-                new_beam.append(new_assignment)
-        
-        # Select the best assignments based on the heuristic
-        new_beam = sorted(new_beam, key=lambda x: -heuristic(problem, x))
-        beam = new_beam[:beam_width]
-        
-        best_assignment = beam[0]
-        if heuristic(problem, best_assignment) == len(problem):
-            return best_assignment, heuristic(problem, best_assignment)
+    beam = np.random.choice([True, False], size=(beam_width, n))
+    scores = score_stack(problem, heuristic, beam)
+    best_index = int(np.argmax(scores))
+    best_assignment, best_score = beam[best_index].copy(), scores[best_index]
+    rows = np.arange(beam_width * n)
+    flipped = np.tile(np.arange(n), beam_width)
+
+    iterations = stalled = 0
+    evaluations = len(beam)
+    while evaluate_clauses(problem, best_assignment) < m and iterations < max_iterations and stalled < patience:
+        iterations += 1
+        # Row b * n + i is beam[b] with variable i flipped
+        neighbours = np.repeat(beam, n, axis=0)
+        neighbours[rows[:len(neighbours)], flipped[:len(neighbours)]] ^= True
+
+        packed = np.packbits(neighbours, axis=1)
+        keys = np.ascontiguousarray(packed).view(np.dtype((np.void, packed.shape[1]))).ravel()
+        _, unique = np.unique(keys, return_index=True)
+        neighbours = neighbours[unique]
+        scores = score_stack(problem, heuristic, neighbours)
+        evaluations += len(neighbours)
+
+        if len(neighbours) > beam_width:
+            top = np.argpartition(-scores, beam_width - 1)[:beam_width]
+        else:
+            top = np.arange(len(neighbours))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        beam, scores = neighbours[top], scores[top]
 
-def vnd(problem, n, heuristic):
+        if scores[0] > best_score:
+            best_assignment, best_score = beam[0].copy(), scores[0]
+            stalled = 0
+        else:
+            stalled += 1
+
+    if stats is not None:
+        stats["iterations"] = iterations
+        stats["evaluations"] = evaluations
+        stats["stalled"] = stalled >= patience
+    return best_assignment, int(best_score)
+
+def vnd(problem, n, heuristic, stats=None):
     # Start with a random assignment
-    assignment = np.random.choice([True, False], size=n)
-    best_score = heuristic(problem, assignment)
+    state = FlipState(problem, n, np.random.choice([True, False], size=n))
     
     neighborhood_size = 1  
-    while neighborhood_size <= 3:  
+    flips = evaluations = 0
+    while neighborhood_size <= min(3, n):
         improved = False
         
         for _ in range(100):  
-            new_assignment = assignment.copy()
-            
-            indices_to_flip = np.random.choice(range(n), size=neighborhood_size, replace=False)
+            indices_to_flip = random.sample(range(n), neighborhood_size)
+            # Flip in place, adding up the delta of each flip; undo if the total is no gain
+            gain = 0
             for i in indices_to_flip:
-                new_assignment[i] = not new_assignment[i]
+                gain += state.delta(i, heuristic)
+                state.flip(i)
+            evaluations += neighborhood_size
             
-            new_score = heuristic(problem, new_assignment)
-            
-            if new_score > best_score:
-                assignment = new_assignment
-                best_score = new_score
+            if gain > 0:
                 improved = True
+                flips += neighborhood_size
                 break
+            for i in reversed(indices_to_flip):
+                state.flip(i)
         
         # If no improvement in this neighborhood, move to a larger neighborhood
         if not improved:
             neighborhood_size += 1
     
-    return assignment, best_score
+    if stats is not None:
+        stats["flips"] = flips
+        stats["evaluations"] = evaluations
+    return np.array(state.assignment), state.score(heuristic)
+
+# Copy of assignment with the logged flips taken back (each flip just toggles its variable)
+def undo_flips(assignment, flipped):
+    previous = assignment[:]
+    for variable in flipped:
+        previous[variable] = not previous[variable]
+    return previous
+
+# Focused random walk (WalkSAT / probSAT). Only unsatisfied clauses are considered: a random
+# one is taken from an index of unsatisfied clauses and one of its variables is flipped.
+# Break counts (how many clauses a flip would make unsatisfied) are cached per variable and
+# kept up to date on every flip. For that each clause stores its number of true literals and
+# the sum of their variable ids, which is the critical variable when only one literal is true.
+# The walk stops at a satisfying assignment, after max_flips flips or after time_limit
+# seconds, and returns the best assignment seen with its heuristic score.
+def walk_sat(problem, n, heuristic, max_flips=1000000, time_limit=None, method="walksat",
+             noise=0.567, cb=2.06, eps=0.9, stats=None):
+    if not isinstance(problem, tuple):
+        problem = encode_problem(problem)
+    assignment = [bool(value) for value in np.random.choice([True, False], size=n)]
+
+    # Duplicate literals are merged; clauses containing x and -x are always satisfied
+    clauses = []
+    for clause in iter_clauses(problem):
+        literals = set(clause)
+        if not any(-literal in literals for literal in literals):
+            clauses.append(sorted(literals))
+    positive = [[] for _ in range(n)]
+    negative = [[] for _ in range(n)]
+    clause_variables = []
+    true_count = []
+    true_sum = []
+    break_count = [0] * n
+    unsatisfied = []
+    position = []  # index of each clause in unsatisfied, -1 when satisfied
+    for index, clause in enumerate(clauses):
+        count = total = 0
+        for literal in clause:
+            variable = abs(literal) - 1
+            (positive if literal > 0 else negative)[variable].append(index)
+            if assignment[variable] == (literal > 0):
+                count += 1
+                total += variable
+        clause_variables.append([abs(literal) - 1 for literal in clause])
+        true_count.append(count)
+        true_sum.append(total)
+        if count == 0:
+            position.append(len(unsatisfied))
+            unsatisfied.append(index)
+        else:
+            position.append(-1)
+            if count == 1:
+                break_count[total] += 1
+
+    def flip(variable):
+        becoming_true = negative[variable] if assignment[variable] else positive[variable]
+        becoming_false = positive[variable] if assignment[variable] else negative[variable]
+        for clause in becoming_true:
+            count = true_count[clause]
+            if count == 0:
+                # Swap-remove from the unsatisfied index
+                last = unsatisfied.pop()
+                if last != clause:
+                    unsatisfied[position[clause]] = last
+                    position[last] = position[clause]
+                position[clause] = -1
+                break_count[variable] += 1
+            elif count == 1:
+                break_count[true_sum[clause]] -= 1
+            true_count[clause] = count + 1
+            true_sum[clause] += variable
+        for clause in becoming_false:
+            count = true_count[clause] - 1
+            true_count[clause] = count
+            true_sum[clause] -= variable
+            if count == 0:
+                position[clause] = len(unsatisfied)
+                unsatisfied.append(clause)
+                break_count[variable] -= 1
+            elif count == 1:
+                break_count[true_sum[clause]] += 1
+        assignment[variable] = not assignment[variable]
+
+    # The best assignment is not copied on every improvement: the variables flipped since then
+    # are logged and toggled back at the end. Only when the log outgrows n is a copy taken and
+    # the log dropped, which keeps both memory and copying at O(1) per flip amortized.
+    best_assignment = None
+    best_unsatisfied = len(unsatisfied)
+    since_best = []
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    start = time.perf_counter()
+    flips = 0
+    while unsatisfied and flips < max_flips:
+        if deadline is not None and flips & 1023 == 0 and time.perf_counter() > deadline:
+            break
+        candidates = clause_variables[unsatisfied[random.randrange(len(unsatisfied))]]
+        if method == "probsat":
+            weights = [(eps + break_count[variable]) ** -cb for variable in candidates]
+            variable = random.choices(candidates, weights)[0]
+        else:
+            breaks = [break_count[variable] for variable in candidates]
+            lowest = min(breaks)
+            if lowest > 0 and random.random() < noise:
+                variable = random.choice(candidates)
+            else:
+                variable = random.choice([v for v, b in zip(candidates, breaks) if b == lowest])
+        flip(variable)
+        flips += 1
+        if len(unsatisfied) < best_unsatisfied:
+            best_unsatisfied = len(unsatisfied)
+            best_assignment = None
+            since_best.clear()
+        elif best_assignment is None:
+            since_best.append(variable)
+            if len(since_best) > n:
+                best_assignment = undo_flips(assignment, since_best)
+                since_best.clear()
+
+    if stats is not None:
+        stats["flips"] = flips
+        stats["seconds"] = time.perf_counter() - start
+    if best_assignment is None:
+        best_assignment = undo_flips(assignment, since_best)
+    best_assignment = np.array(best_assignment)
+    return best_assignment, heuristic(problem, best_assignment)
+
+if __name__ == "__main__":
+    # Example usage
+    n = 5  # Number of variables
+    k = 3  # Length of each clause
+    m = 4  # Number of clauses
+
+    problem = create_k_sat_problem(n, k, m)
+    for clause in problem:
+        print(' OR '.join(clause))
+
+    n = 5  # Number of variables
+    k = 3  # Clause length
+    m = 10  # Number of clauses
+    problem = create_k_sat_problem(n, k, m)
 
-n = 5  # Number of variables
-k = 3  # Clause length
-m = 10  # Number of clauses
-problem = create_k_sat_problem(n, k, m)
+    assignment_hc, score_hc = hill_climbing(problem, n, heuristic_1)
+    print("Hill-Climbing Assignment:", assignment_hc)
+    print("Hill-Climbing Score:", score_hc)
 
-assignment_hc, score_hc = hill_climbing(problem, n, heuristic_1)
-print("Hill-Climbing Assignment:", assignment_hc)
-print("Hill-Climbing Score:", score_hc)
+    assignment_bs, score_bs = beam_search(problem, n, beam_width=3, heuristic=heuristic_1)
+    print("Beam Search Assignment (Beam Width 3):", assignment_bs)
+    print("Beam Search Score:", score_bs)
 
-assignment_bs, score_bs = beam_search(problem, n, beam_width=3, heuristic=heuristic_1)
-print("Beam Search Assignment (Beam Width 3):", assignment_bs)
-print("Beam Search Score:", score_bs)
+    assignment_vnd, score_vnd = vnd(problem, n, heuristic_1)
+    print("VND Assignment:", assignment_vnd)
+    print("VND Score:", score_vnd)
 
-assignment_vnd, score_vnd = vnd(problem, n, heuristic_1)
-print("VND Assignment:", assignment_vnd)
-print("VND Score:", score_vnd)
+    for method in ("walksat", "probsat"):
+        assignment_walk, score_walk = walk_sat(problem, n, heuristic_1, max_flips=10000, method=method)
+        print(f"{method} Assignment:", assignment_walk)
+        print(f"{method} Score:", score_walk)
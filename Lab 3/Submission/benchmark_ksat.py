@@ -0,0 +1,91 @@
+import os
+import random
+import sys
+import time
+import numpy as np
+# Shared modules live in common/ at the repository root (see common/README.md)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "common"))
+from benchmark_results import write_results
+from KSAT import create_k_sat_problem, encode_problem, evaluate_clauses, heuristic_1, hill_climbing, beam_search, vnd, walk_sat
+
+# Phase-transition benchmark for the random k-SAT solvers.
+# Seeded instances are generated for every n and clause ratio m/n, with the ratios spread
+# around the satisfiability threshold (about 4.27 for 3-SAT), and every solver is run on each
+# of them. One result row per (n, ratio, solver) holds the success rate (all clauses
+# satisfied), median and p95 wall time, flips per second and the mean number of flips and
+# move evaluations per run. Results are written as JSON or CSV (chosen by the file extension)
+# so runs before and after a solver change can be diffed.
+
+SOLVERS = {
+    "hill_climbing": lambda problem, n, stats: hill_climbing(problem, n, heuristic_1, stats=stats),
+    "beam_search": lambda problem, n, stats: beam_search(problem, n, 10, heuristic_1, stats=stats),
+    "vnd": lambda problem, n, stats: vnd(problem, n, heuristic_1, stats=stats),
+    "walksat": lambda problem, n, stats: walk_sat(problem, n, heuristic_1, max_flips=1000 * n, stats=stats),
+    "probsat": lambda problem, n, stats: walk_sat(problem, n, heuristic_1, max_flips=1000 * n, method="probsat",
+                                                 stats=stats),
+}
+
+FIELDS = ["n", "k", "ratio", "m", "solver", "runs", "success_rate", "median_seconds", "p95_seconds",
+          "flips_per_second", "mean_flips", "mean_evaluations"]
+
+def run_solver(solver, problem, n, seed):
+    random.seed(seed)
+    np.random.seed(seed)
+    stats = {}
+    start = time.perf_counter()
+    assignment, _ = SOLVERS[solver](problem, n, stats)
+    seconds = time.perf_counter() - start
+    return evaluate_clauses(problem, assignment) == len(problem), seconds, stats
+
+def benchmark_point(n, k, ratio, solvers, instances, seed):
+    """Run every solver on the same seeded instances; returns one row per solver."""
+    m = int(round(ratio * n))
+    problems = []
+    for instance in range(instances):
+        np.random.seed(seed + instance)
+        problems.append(encode_problem(create_k_sat_problem(n, k, m, flat=True)))
+
+    rows = []
+    for solver in solvers:
+        runs = [run_solver(solver, problem, n, seed + instance) for instance, problem in enumerate(problems)]
+        seconds = np.array([run[1] for run in runs])
+        flips = [run[2].get("flips") for run in runs]
+        evaluations = [run[2].get("evaluations") for run in runs]
+        row = {"n": n, "k": k, "ratio": ratio, "m": m, "solver": solver, "runs": len(runs),
+               "success_rate": sum(run[0] for run in runs) / len(runs),
+               "median_seconds": float(np.median(seconds)),
+               "p95_seconds": float(np.percentile(seconds, 95))}
+        # Beam search makes no flips and WalkSAT does no separate evaluations; those stay empty
+        if None not in flips:
+            row["mean_flips"] = sum(flips) / len(runs)
+            row["flips_per_second"] = sum(flips) / max(seconds.sum(), 1e-9)
+        if None not in evaluations:
+            row["mean_evaluations"] = sum(evaluations) / len(runs)
+        rows.append(row)
+    return rows
+
+def run_benchmark(sizes=(20, 50, 100, 200), ratios=(3.0, 3.5, 4.0, 4.27, 4.5, 5.0), k=3,
+                  solvers=tuple(SOLVERS), instances=10, beam_limit=100, seed=0):
+    results = []
+    for n in sizes:
+        for ratio in ratios:
+            point_solvers = [solver for solver in solvers if solver != "beam_search" or n <= beam_limit]
+            results.extend(benchmark_point(n, k, ratio, point_solvers, instances, seed))
+    return results
+
+def print_results(results):
+    print(f"{'n':>5} {'ratio':>5} {'solver':>14} {'success':>7} {'median s':>9} {'p95 s':>8} "
+          f"{'flips/s':>10} {'evaluations':>11}")
+    for row in results:
+        flips_per_second = f"{row['flips_per_second']:10.0f}" if "flips_per_second" in row else f"{'-':>10}"
+        evaluations = f"{row['mean_evaluations']:11.0f}" if "mean_evaluations" in row else f"{'-':>11}"
+        print(f"{row['n']:5} {row['ratio']:5.2f} {row['solver']:>14} {row['success_rate']:7.2f} "
+              f"{row['median_seconds']:9.4f} {row['p95_seconds']:8.4f} {flips_per_second} {evaluations}")
+
+
+if __name__ == "__main__":
+    output = sys.argv[1] if len(sys.argv) > 1 else "benchmark_ksat.json"
+    results = run_benchmark()
+    print_results(results)
+    write_results(results, output, FIELDS)
+    print(f"Results written to {output}")
@@ -0,0 +1,325 @@
+import heapq
+import numpy as np
+from KSAT import encode_problem, iter_clauses, num_clauses, evaluate_clauses, heuristic_1, walk_sat
+
+# Complete CDCL solver for the k-SAT formulas of KSAT.py.
+# Literals are numbered 2 * v for x(v+1) and 2 * v + 1 for its negation, so lit ^ 1 negates.
+# Every clause of two or more literals watches its first two positions; when a watched literal
+# becomes false the clause looks for another non-false literal to watch, and otherwise it is
+# unit (its first literal is implied) or in conflict. Conflicts are analysed back to the first
+# unique implication point, the learned clause is minimised against the reasons of its
+# literals, and the search jumps back to the second highest level in it. Branching follows
+# VSIDS activities kept in a lazy heap with saved phases, restarts follow the Luby sequence,
+# and learned clauses with a high LBD (number of decision levels) are dropped periodically.
+# The result is a model, or None when the formula is proven unsatisfiable.
+
+RESTART_BASE = 100
+VAR_DECAY = 0.95
+
+def luby(i):
+    """i-th element (0-based) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, ..."""
+    size, exponent = 1, 0
+    while size < i + 1:
+        exponent += 1
+        size = 2 * size + 1
+    while size - 1 != i:
+        size = (size - 1) >> 1
+        exponent -= 1
+        i %= size
+    return 1 << exponent
+
+class CDCLSolver:
+    def __init__(self, problem, n):
+        self.n = n
+        self.clauses = []
+        self.learned = []  # (clause index, LBD) of learned clauses
+        self.deleted = []
+        self.watches = [[] for _ in range(2 * n)]
+        self.value = [0] * (2 * n)  # per literal: 1 true, -1 false, 0 unassigned
+        self.level = [0] * n
+        self.reason = [-1] * n
+        self.trail = []
+        self.trail_lim = []
+        self.queue_head = 0
+        self.activity = [0.0] * n
+        self.var_inc = 1.0
+        self.phase = [1] * n  # saved polarity (the literal offset, so 1 is negative)
+        self.heap = [(0.0, v) for v in range(n)]
+        self.seen = [False] * n
+        self.unsatisfiable = False
+        self.stats = {"decisions": 0, "propagations": 0, "conflicts": 0, "restarts": 0,
+                      "learned": 0, "deleted": 0}
+
+        for clause in iter_clauses(problem):
+            literals = sorted({2 * (abs(l) - 1) + (l < 0) for l in clause})
+            if any(literal ^ 1 in literals for literal in literals):
+                continue  # tautology
+            if not literals:
+                self.unsatisfiable = True
+            elif len(literals) == 1:
+                if self.value[literals[0]] == -1:
+                    self.unsatisfiable = True
+                elif self.value[literals[0]] == 0:
+                    self.enqueue(literals[0], -1)
+            else:
+                self.add_clause(literals)
+
+    def add_clause(self, literals):
+        index = len(self.clauses)
+        self.clauses.append(literals)
+        self.deleted.append(False)
+        self.watches[literals[0]].append(index)
+        self.watches[literals[1]].append(index)
+        return index
+
+    def enqueue(self, literal, reason):
+        self.value[literal] = 1
+        self.value[literal ^ 1] = -1
+        self.level[literal >> 1] = len(self.trail_lim)
+        self.reason[literal >> 1] = reason
+        self.trail.append(literal)
+
+    def propagate(self):
+        """Unit propagation over the trail; returns a conflicting clause index or None."""
+        value, clauses, watches, deleted = self.value, self.clauses, self.watches, self.deleted
+        trail = self.trail
+        while self.queue_head < len(trail):
+            false_literal = trail[self.queue_head] ^ 1
+            self.queue_head += 1
+            self.stats["propagations"] += 1
+            watching = watches[false_literal]
+            i = j = 0
+            end = len(watching)
+            while i < end:
+                index = watching[i]
+                i += 1
+                if deleted[index]:
+                    continue
+                clause = clauses[index]
+                # Keep the false literal in position 1
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], false_literal
+                first = clause[0]
+                if value[first] == 1:
+                    watching[j] = index
+                    j += 1
+                    continue
+                for k in range(2, len(clause)):
+                    if value[clause[k]] != -1:
+                        clause[1], clause[k] = clause[k], false_literal
+                        watches[clause[1]].append(index)
+                        break
+                else:
+                    watching[j] = index
+                    j += 1
+                    if value[first] == -1:
+                        # Conflict: keep the unvisited watches and stop
+                        watching[j:] = watching[i:end]
+                        self.queue_head = len(trail)
+                        return index
+                    self.enqueue(first, index)
+            del watching[j:]
+        return None
+
+    def bump(self, variable):
+        self.activity[variable] += self.var_inc
+        if self.activity[variable] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self.rebuild_heap()
+        elif self.value[2 * variable] == 0:
+            heapq.heappush(self.heap, (-self.activity[variable], variable))
+
+    def rebuild_heap(self):
+        self.heap = [(-self.activity[v], v) for v in range(self.n) if self.value[2 * v] == 0]
+        heapq.heapify(self.heap)
+
+    def analyze(self, conflict):
+        """First-UIP learned clause for conflict; returns (clause, backjump level, LBD)."""
+        seen, level, reason, clauses, trail = self.seen, self.level, self.reason, self.clauses, self.trail
+        current = len(self.trail_lim)
+        learned = [None]
+        pending = 0
+        literal = None
+        index = len(trail) - 1
+        while True:
+            clause = clauses[conflict]
+            for q in (clause if literal is None else clause[1:]):
+                v = q >> 1
+                if not seen[v] and level[v] > 0:
+                    seen[v] = True
+                    self.bump(v)
+                    if level[v] >= current:
+                        pending += 1
+                    else:
+                        learned.append(q)
+            # Next literal of the current level on the trail, walking backwards
+            while not seen[trail[index] >> 1]:
+                index -= 1
+            literal = trail[index]
+            index -= 1
+            conflict = reason[literal >> 1]
+            seen[literal >> 1] = False
+            pending -= 1
+            if pending == 0:
+                break
+        learned[0] = literal ^ 1
+
+        # Drop literals implied by the rest of the clause
+        kept = [learned[0]]
+        for q in learned[1:]:
+            r = reason[q >> 1]
+            if r == -1 or not all(seen[x >> 1] or level[x >> 1] == 0 for x in clauses[r][1:]):
+                kept.append(q)
+        for q in learned[1:]:
+            seen[q >> 1] = False
+        learned = kept
+
+        if len(learned) == 1:
+            return learned, 0, 1
+        # The literal with the highest level below the current one becomes the second watch
+        best = max(range(1, len(learned)), key=lambda position: level[learned[position] >> 1])
+        learned[1], learned[best] = learned[best], learned[1]
+        lbd = len({level[q >> 1] for q in learned})
+        return learned, level[learned[1] >> 1], lbd
+
+    def backtrack(self, target_level):
+        if len(self.trail_lim) <= target_level:
+            return
+        start = self.trail_lim[target_level]
+        value, heap, activity = self.value, self.heap, self.activity
+        for literal in self.trail[start:]:
+            v = literal >> 1
+            self.phase[v] = literal & 1
+            value[literal] = value[literal ^ 1] = 0
+            self.reason[v] = -1
+            heapq.heappush(heap, (-activity[v], v))
+        del self.trail[start:]
+        del self.trail_lim[target_level:]
+        self.queue_head = len(self.trail)
+        if len(heap) > 4 * self.n + 1000:
+            self.rebuild_heap()
+
+    def pick_branch_variable(self):
+        heap, value = self.heap, self.value
+        while heap:
+            _, v = heapq.heappop(heap)
+            if value[2 * v] == 0:
+                return v
+        return None
+
+    def reduce_learned(self):
+        """Delete the worse half of the learned clauses with LBD > 2 that are not reasons."""
+        clauses, value, reason = self.clauses, self.value, self.reason
+        candidates = []
+        keep = []
+        for index, lbd in self.learned:
+            first = clauses[index][0]
+            locked = value[first] == 1 and reason[first >> 1] == index
+            if lbd > 2 and not locked:
+                candidates.append((lbd, len(clauses[index]), index))
+            else:
+                keep.append((index, lbd))
+        candidates.sort()
+        half = len(candidates) // 2
+        for lbd, _, index in candidates[half:]:
+            self.deleted[index] = True
+            clauses[index] = []
+        self.stats["deleted"] += len(candidates) - half
+        self.learned = keep + [(index, lbd) for lbd, _, index in candidates[:half]]
+
+    def solve(self):
+        """Return a model as a boolean array, or None if the formula is unsatisfiable."""
+        if self.unsatisfiable:
+            return None
+        stats = self.stats
+        restarts = 0
+        restart_limit = RESTART_BASE * luby(0)
+        conflicts_since_restart = 0
+        max_learned = max(1000, len(self.clauses) // 3)
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                stats["conflicts"] += 1
+                conflicts_since_restart += 1
+                if not self.trail_lim:
+                    return None
+                learned, backjump, lbd = self.analyze(conflict)
+                self.backtrack(backjump)
+                if len(learned) == 1:
+                    self.enqueue(learned[0], -1)
+                else:
+                    index = self.add_clause(learned)
+                    self.learned.append((index, lbd))
+                    self.enqueue(learned[0], index)
+                stats["learned"] += 1
+                self.var_inc /= VAR_DECAY
+
+                if conflicts_since_restart >= restart_limit:
+                    restarts += 1
+                    stats["restarts"] = restarts
+                    restart_limit = RESTART_BASE * luby(restarts)
+                    conflicts_since_restart = 0
+                    self.backtrack(0)
+                if len(self.learned) >= max_learned:
+                    self.reduce_learned()
+                    max_learned = int(max_learned * 1.1)
+            else:
+                v = self.pick_branch_variable()
+                if v is None:
+                    return np.array([self.value[2 * v] == 1 for v in range(self.n)])
+                stats["decisions"] += 1
+                self.trail_lim.append(len(self.trail))
+                self.enqueue(2 * v + self.phase[v], -1)
+
+def cdcl(problem, n, stats=None):
+    """Complete search; returns a satisfying assignment, or None if there is none."""
+    solver = CDCLSolver(problem, n)
+    model = solver.solve()
+    if stats is not None:
+        stats.update(solver.stats)
+    return model
+
+def solve(problem, n, max_flips=None, stats=None):
+    """WalkSAT as a fast first attempt, CDCL as the fallback; returns a model or None (UNSAT)."""
+    if not isinstance(problem, tuple):
+        problem = encode_problem(problem)
+    if max_flips is None:
+        max_flips = 100 * n
+    assignment, score = walk_sat(problem, n, heuristic_1, max_flips=max_flips)
+    if score == num_clauses(problem):
+        if stats is not None:
+            stats["solver"] = "walksat"
+        return assignment
+    if stats is not None:
+        stats["solver"] = "cdcl"
+    return cdcl(problem, n, stats)
+
+
+if __name__ == "__main__":
+    import time
+    from KSAT import create_k_sat_problem
+
+    # Pigeonhole principle: n + 1 pigeons in n holes, unsatisfiable
+    holes = 6
+    variable = lambda pigeon, hole: pigeon * holes + hole + 1
+    pigeonhole = [[variable(p, h) for h in range(holes)] for p in range(holes + 1)]
+    pigeonhole += [[-variable(p, h), -variable(q, h)] for h in range(holes)
+                   for p in range(holes + 1) for q in range(p + 1, holes + 1)]
+    width = max(len(clause) for clause in pigeonhole)
+    pigeonhole = np.array([clause + [clause[0]] * (width - len(clause)) for clause in pigeonhole], dtype=np.int32)
+    stats = {}
+    start = time.perf_counter()
+    model = cdcl(pigeonhole, (holes + 1) * holes, stats)
+    print(f"Pigeonhole {holes + 1}/{holes}: {'SAT' if model is not None else 'UNSAT'} "
+          f"in {time.perf_counter() - start:.2f}s, {stats['conflicts']} conflicts")
+
+    np.random.seed(0)
+    for n, ratio in ((100, 4.26), (150, 4.26), (100, 6.0)):
+        problem = create_k_sat_problem(n, 3, int(ratio * n), flat=True)
+        stats = {}
+        start = time.perf_counter()
+        model = solve(problem, n, stats=stats)
+        elapsed = time.perf_counter() - start
+        verdict = "UNSAT" if model is None else f"SAT ({evaluate_clauses(problem, model)} clauses satisfied)"
+        print(f"n={n}, m/n={ratio}: {verdict} by {stats['solver']} in {elapsed:.2f}s")
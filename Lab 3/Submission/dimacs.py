@@ -0,0 +1,179 @@
+import os
+import numpy as np
+
+# DIMACS CNF reader and writer for large SAT instances.
+# A formula is kept flat: one int32 array with the literals of all clauses one after another
+# (signed 1-based variable indices, as in the file) and an int64 array of clause offsets, so
+# clause i is literals[offsets[i]:offsets[i + 1]]. The reader parses the file in chunks of
+# bytes straight into these arrays. With cache=True the arrays are also written next to the
+# file (name.cnf.literals / name.cnf.offsets) and returned memory-mapped; later loads of an
+# unchanged file only map the cache.
+
+CHUNK_SIZE = 1 << 24
+
+def cache_paths(path):
+    return path + ".literals", path + ".offsets"
+
+def parse_tokens(text):
+    """Integers of a chunk of whole lines, skipping comment and header lines."""
+    if b"c" in text or b"p" in text:
+        text = b"\n".join(line for line in text.split(b"\n") if line.strip()[:1] not in (b"c", b"p"))
+    if not text.strip():
+        return np.zeros(0, dtype=np.int32)
+    # Raises ValueError on anything that is not an integer
+    return np.fromstring(text, dtype=np.int32, sep=" ")
+
+def read_header(path):
+    """Return (num_variables, num_clauses) from the 'p cnf' line."""
+    with open(path, "rb") as f:
+        for line in f:
+            fields = line.split()
+            if fields[:2] == [b"p", b"cnf"]:
+                return int(fields[2]), int(fields[3])
+    raise ValueError(f"{path}: missing 'p cnf' header")
+
+def iter_chunks(path, chunk_size=CHUNK_SIZE):
+    """Yield (literals, clause ends) per chunk; ends count literals from the start of the file."""
+    total = 0
+    last_end = 0
+    rest = b""
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(chunk_size)
+            if not block:
+                text, rest = rest, b""
+            else:
+                # Only whole lines are parsed; the tail waits for the next block
+                text = rest + block
+                cut = text.rfind(b"\n") + 1
+                text, rest = text[:cut], text[cut:]
+            # SATLIB files end with a '%' line followed by junk
+            end = (b"\n" + text).find(b"\n%")
+            if end >= 0:
+                text, rest, block = text[:end], b"", b""
+            tokens = parse_tokens(text)
+            zeros = np.flatnonzero(tokens == 0)
+            literals = tokens[tokens != 0]
+            # Literals before each terminating 0: its position minus the zeros before it
+            ends = zeros - np.arange(len(zeros)) + total
+            total += len(literals)
+            if len(ends):
+                last_end = int(ends[-1])
+            if not block and total != last_end:
+                raise ValueError(f"{path}: last clause is not terminated by 0")
+            yield literals, ends
+            if not block:
+                break
+
+def read_dimacs(path, chunk_size=CHUNK_SIZE, cache=False):
+    """Load a DIMACS CNF file; returns (num_variables, (literals, offsets))."""
+    num_variables, num_clauses = read_header(path)
+    literals_path, offsets_path = cache_paths(path)
+    if cache and all(os.path.exists(p) and os.path.getmtime(p) >= os.path.getmtime(path)
+                     for p in (literals_path, offsets_path)):
+        return num_variables, load_cache(literals_path, offsets_path)
+
+    if cache:
+        with open(literals_path + ".tmp", "wb") as literals_file, open(offsets_path + ".tmp", "wb") as offsets_file:
+            offsets_file.write(np.zeros(1, dtype=np.int64).tobytes())
+            for literals, ends in iter_chunks(path, chunk_size):
+                literals_file.write(literals.tobytes())
+                offsets_file.write(ends.astype(np.int64).tobytes())
+        os.replace(literals_path + ".tmp", literals_path)
+        os.replace(offsets_path + ".tmp", offsets_path)
+        formula = load_cache(literals_path, offsets_path)
+    else:
+        chunks = list(iter_chunks(path, chunk_size))
+        literals = np.concatenate([np.zeros(0, dtype=np.int32)] + [chunk for chunk, _ in chunks])
+        offsets = np.concatenate([np.zeros(1, dtype=np.int64)] + [ends.astype(np.int64) for _, ends in chunks])
+        formula = literals, offsets
+
+    if len(formula[1]) - 1 != num_clauses:
+        raise ValueError(f"{path}: header announces {num_clauses} clauses, found {len(formula[1]) - 1}")
+    return num_variables, formula
+
+def load_cache(literals_path, offsets_path):
+    def mapped(p, dtype):
+        # np.memmap refuses empty files
+        if os.path.getsize(p) == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(p, dtype=dtype, mode="r")
+    return mapped(literals_path, np.int32), mapped(offsets_path, np.int64)
+
+def write_dimacs(path, formula, num_variables, comment=None, chunk_clauses=1 << 18):
+    """Write a flat (literals, offsets) formula as DIMACS CNF, chunk_clauses clauses at a time."""
+    literals, offsets = formula
+    num_clauses = len(offsets) - 1
+    with open(path, "w") as f:
+        if comment:
+            for line in comment.splitlines():
+                f.write(f"c {line}\n")
+        f.write(f"p cnf {num_variables} {num_clauses}\n")
+        for first in range(0, num_clauses, chunk_clauses):
+            last = min(first + chunk_clauses, num_clauses)
+            start = int(offsets[first])
+            ends = np.asarray(offsets[first + 1:last + 1]) - start
+            tokens = np.insert(np.asarray(literals[start:int(offsets[last])]), ends, 0)
+            # Every " 0 " ends a clause: no literal is 0 and no other token ends in " 0"
+            text = " ".join(map(str, tokens.tolist())) + "\n"
+            f.write(text.replace(" 0 ", " 0\n"))
+
+def iter_clauses(formula, block_size=1 << 16):
+    """Clauses of a flat formula as lists of literals, converted block_size clauses at a time."""
+    literals, offsets = formula
+    num_clauses = len(offsets) - 1
+    for first in range(0, num_clauses, block_size):
+        last = min(first + block_size, num_clauses)
+        start = int(offsets[first])
+        block = np.asarray(literals[start:int(offsets[last])]).tolist()
+        bounds = (np.asarray(offsets[first:last + 1]) - start).tolist()
+        for i in range(last - first):
+            yield block[bounds[i]:bounds[i + 1]]
+
+def to_matrix(formula):
+    """(m x k) int32 clause matrix of a flat formula, k the longest clause length.
+
+    Only the vectorized evaluators need this form; the flip-based solvers read the flat
+    arrays through iter_clauses.
+
+    Shorter clauses are padded by repeating their first literal, which leaves satisfaction
+    unchanged (heuristic_2 counts the repeated literal once per copy).
+    """
+    literals, offsets = formula
+    lengths = np.diff(offsets)
+    if len(lengths) == 0:
+        return np.zeros((0, 0), dtype=np.int32)
+    if lengths.min() == 0:
+        raise ValueError("formula contains an empty clause")
+    k = int(lengths.max())
+    if lengths.min() == k:
+        return np.asarray(literals, dtype=np.int32).reshape(-1, k)
+    positions = offsets[:-1, None] + np.arange(k)[None, :]
+    positions = np.where(np.arange(k)[None, :] < lengths[:, None], positions, offsets[:-1, None])
+    return np.asarray(literals, dtype=np.int32)[positions]
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from KSAT import create_k_sat_problem, walk_sat, heuristic_1
+
+    n, k, m = 1000000, 3, 4200000
+    start = time.perf_counter()
+    formula = create_k_sat_problem(n, k, m, flat=True)
+    print(f"Generated {m} clauses in {time.perf_counter() - start:.2f}s")
+
+    path = os.path.join(tempfile.mkdtemp(), "random.cnf")
+    start = time.perf_counter()
+    write_dimacs(path, formula, n, comment=f"random {k}-SAT, n={n}, m={m}")
+    print(f"Wrote {os.path.getsize(path) >> 20} MiB in {time.perf_counter() - start:.2f}s")
+
+    for run in ("parse", "cached"):
+        start = time.perf_counter()
+        num_variables, loaded = read_dimacs(path, cache=True)
+        print(f"Loaded ({run}) in {time.perf_counter() - start:.2f}s, identical: "
+              f"{np.array_equal(loaded[0], formula[0]) and np.array_equal(loaded[1], formula[1])}")
+
+    stats = {}
+    assignment, score = walk_sat(loaded, num_variables, heuristic_1, max_flips=200000, stats=stats)
+    print(f"WalkSAT: {score}/{m} clauses satisfied after {stats['flips']} flips")
@@ -0,0 +1,136 @@
+import os
+import random
+import tempfile
+import time
+from multiprocessing import Pool
+import numpy as np
+from KSAT import encode_problem, evaluate_clauses, heuristic_1, hill_climbing, beam_search, vnd, walk_sat
+
+# Parallel restart portfolio for the k-SAT local-search solvers.
+# Every task is one seeded restart of one strategy. The clause matrix is saved once to a .npy
+# file that every worker memory-maps in its initializer, so tasks only carry (strategy, seed)
+# and all processes share the same pages. Results come back as they finish; the first
+# satisfying assignment stops the portfolio, and leaving the pool terminates the workers
+# that are still running. Runs are tallied per strategy into win rates.
+
+STRATEGIES = {
+    "hill_climbing": lambda problem, n, heuristic: hill_climbing(problem, n, heuristic),
+    "beam_search": lambda problem, n, heuristic: beam_search(problem, n, 10, heuristic),
+    "vnd": lambda problem, n, heuristic: vnd(problem, n, heuristic),
+    "walksat": lambda problem, n, heuristic: walk_sat(problem, n, heuristic, max_flips=100 * n),
+    "probsat": lambda problem, n, heuristic: walk_sat(problem, n, heuristic, max_flips=100 * n, method="probsat"),
+}
+
+worker = {}
+
+def init_worker(problem_path, n, heuristic):
+    worker["problem"] = np.load(problem_path, mmap_mode="r")
+    worker["n"] = n
+    worker["heuristic"] = heuristic
+
+def init_worker_in_process(problem, n, heuristic):
+    worker["problem"] = problem
+    worker["n"] = n
+    worker["heuristic"] = heuristic
+
+def run_restart(task):
+    """Run one seeded restart; returns (strategy, seed, satisfied, score, seconds, assignment)."""
+    strategy, seed = task
+    random.seed(seed)
+    np.random.seed(seed)
+    problem = worker["problem"]
+    start = time.perf_counter()
+    assignment, score = STRATEGIES[strategy](problem, worker["n"], worker["heuristic"])
+    seconds = time.perf_counter() - start
+    satisfied = evaluate_clauses(problem, assignment) == len(problem)
+    return strategy, seed, satisfied, score, seconds, assignment
+
+def make_tasks(strategies, restarts, seed):
+    # Strategies are interleaved so an early stop still leaves every one of them sampled
+    return [(strategy, seed + restart * len(strategies) + index)
+            for restart in range(restarts) for index, strategy in enumerate(strategies)]
+
+def summarize(results, strategies):
+    summary = {}
+    for strategy in strategies:
+        runs = [result for result in results if result[0] == strategy]
+        wins = sum(1 for result in runs if result[2])
+        summary[strategy] = {
+            "runs": len(runs),
+            "wins": wins,
+            "win_rate": wins / len(runs) if runs else 0.0,
+            "mean_seconds": sum(result[4] for result in runs) / len(runs) if runs else 0.0,
+        }
+    return summary
+
+def run_portfolio(problem, n, heuristic=heuristic_1, strategies=tuple(STRATEGIES), restarts=8,
+                  processes=None, seed=0, stop_on_solution=True, stats=None):
+    """Run restarts x strategies seeded solver runs; returns (assignment, score) of the best run.
+
+    With stop_on_solution the portfolio ends at the first satisfying assignment, otherwise every
+    restart is run, which gives unbiased win rates. stats receives the per-strategy summary,
+    the winning strategy and seed, and the wall time.
+    """
+    problem = encode_problem(problem)
+    tasks = make_tasks(strategies, restarts, seed)
+    results = []
+    best = None
+    start = time.perf_counter()
+
+    def record(result):
+        nonlocal best
+        results.append(result)
+        if best is None or (result[2], result[3]) > (best[2], best[3]):
+            best = result
+        return stop_on_solution and result[2]
+
+    if processes == 1:
+        init_worker_in_process(problem, n, heuristic)
+        for task in tasks:
+            if record(run_restart(task)):
+                break
+    else:
+        directory = tempfile.mkdtemp()
+        problem_path = os.path.join(directory, "clauses.npy")
+        np.save(problem_path, problem)
+        try:
+            with Pool(processes, initializer=init_worker, initargs=(problem_path, n, heuristic)) as pool:
+                for result in pool.imap_unordered(run_restart, tasks):
+                    if record(result):
+                        break
+        finally:
+            os.remove(problem_path)
+            os.rmdir(directory)
+
+    if stats is not None:
+        stats["strategies"] = summarize(results, strategies)
+        stats["runs"] = len(results)
+        stats["winner"] = (best[0], best[1]) if best is not None and best[2] else None
+        stats["seconds"] = time.perf_counter() - start
+    if best is None:
+        return None, 0
+    return best[5], best[3]
+
+def print_summary(stats):
+    print(f"{'strategy':>14} {'runs':>5} {'wins':>5} {'win rate':>9} {'mean s':>8}")
+    for strategy, row in stats["strategies"].items():
+        print(f"{strategy:>14} {row['runs']:5} {row['wins']:5} {row['win_rate']:9.2f} {row['mean_seconds']:8.3f}")
+
+
+if __name__ == "__main__":
+    from KSAT import create_k_sat_problem
+
+    np.random.seed(1)
+    n = 200
+    problem = create_k_sat_problem(n, 3, int(4.1 * n), flat=True)
+
+    # Win rates: every restart runs to completion
+    stats = {}
+    run_portfolio(problem, n, restarts=4, stop_on_solution=False, stats=stats)
+    print(f"{stats['runs']} runs in {stats['seconds']:.2f}s")
+    print_summary(stats)
+
+    # Time to solution: stop at the first satisfying assignment
+    stats = {}
+    assignment, score = run_portfolio(problem, n, restarts=20, stats=stats)
+    print(f"Winner {stats['winner']} after {stats['runs']} runs in {stats['seconds']:.2f}s, score {score}")
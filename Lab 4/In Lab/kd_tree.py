@@ -0,0 +1,150 @@
+import numpy as np
+
+# KD-tree over 2-D city coordinates, built with NumPy (no SciPy needed).
+# Nodes are stored in flat arrays: every node owns the slice start:end of the permuted index
+# array and the bounding box of its points; inner nodes split at the median of the wider box
+# side. K-nearest-neighbour lists are computed one leaf at a time: a radius that surely holds
+# k neighbours of every point in the leaf is taken from a small enclosing subtree, and the
+# distances to all points of the leaves within that radius are then computed in one block.
+# For nearest-neighbour tours the tree also keeps a count of not yet removed points per node,
+# so queries for the nearest remaining point skip emptied subtrees.
+
+LEAF_SIZE = 32
+
+class KDTree:
+    def __init__(self, points, leaf_size=LEAF_SIZE):
+        self.points = np.asarray(points, dtype=np.float64)
+        n = len(self.points)
+        self.index = np.arange(n)
+        starts, ends, lefts, rights, parents = [], [], [], [], []
+        stack = [(0, n, -1, False)]
+        while stack:
+            start, end, parent, is_right = stack.pop()
+            node = len(starts)
+            starts.append(start)
+            ends.append(end)
+            lefts.append(-1)
+            rights.append(-1)
+            parents.append(parent)
+            if parent >= 0:
+                (rights if is_right else lefts)[parent] = node
+            if end - start <= leaf_size:
+                continue
+            members = self.index[start:end]
+            coordinates = self.points[members]
+            dimension = int(np.argmax(np.ptp(coordinates, axis=0)))
+            middle = (end - start) // 2
+            order = np.argpartition(coordinates[:, dimension], middle)
+            self.index[start:end] = members[order]
+            stack.append((start + middle, end, node, True))
+            stack.append((start, start + middle, node, False))
+
+        self.start = np.array(starts)
+        self.end = np.array(ends)
+        self.left = lefts
+        self.right = rights
+        self.parent = parents
+        self.is_leaf = [left < 0 for left in lefts]
+        self.lower = np.empty((len(starts), 2))
+        self.upper = np.empty((len(starts), 2))
+        for node in range(len(starts)):
+            coordinates = self.points[self.index[starts[node]:ends[node]]]
+            self.lower[node] = coordinates.min(axis=0) if len(coordinates) else np.inf
+            self.upper[node] = coordinates.max(axis=0) if len(coordinates) else -np.inf
+        self.leaf_of = np.empty(n, dtype=np.int64)
+        for node in range(len(starts)):
+            if self.is_leaf[node]:
+                self.leaf_of[self.index[starts[node]:ends[node]]] = node
+        self.removed = np.zeros(n, dtype=bool)
+        self.reset()
+
+    def box_distance(self, node, lower, upper):
+        """Smallest distance between the box of node and the box [lower, upper]."""
+        gap = np.maximum(0.0, np.maximum(self.lower[node] - upper, lower - self.upper[node]))
+        return float(np.hypot(gap[0], gap[1]))
+
+    def leaves_within(self, lower, upper, radius):
+        leaves = []
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if self.box_distance(node, lower, upper) > radius:
+                continue
+            if self.is_leaf[node]:
+                leaves.append(node)
+            else:
+                stack.append(self.left[node])
+                stack.append(self.right[node])
+        return leaves
+
+    def members(self, nodes):
+        return np.concatenate([self.index[self.start[node]:self.end[node]] for node in nodes])
+
+    def k_nearest(self, k):
+        """(n x k) int32 array of the k nearest other points of every point, nearest first."""
+        n = len(self.points)
+        k = min(k, n - 1)
+        neighbours = np.empty((n, k), dtype=np.int32)
+        if k <= 0:
+            return neighbours
+        for leaf in range(len(self.is_leaf)):
+            if not self.is_leaf[leaf] or self.start[leaf] == self.end[leaf]:
+                continue
+            queries = self.index[self.start[leaf]:self.end[leaf]]
+            # The lowest ancestor with more than k points bounds the k-th neighbour distance
+            enclosing = leaf
+            while self.end[enclosing] - self.start[enclosing] <= k:
+                enclosing = self.parent[enclosing]
+            nearby = self.index[self.start[enclosing]:self.end[enclosing]]
+            distances = np.hypot(*(self.points[queries, None, :] - self.points[None, nearby, :]).transpose(2, 0, 1))
+            radius = float(np.partition(distances, k, axis=1)[:, k].max())
+
+            candidates = self.members(self.leaves_within(self.lower[leaf], self.upper[leaf], radius))
+            distances = np.hypot(*(self.points[queries, None, :] - self.points[None, candidates, :]).transpose(2, 0, 1))
+            distances[candidates[None, :] == queries[:, None]] = np.inf
+            nearest = np.argpartition(distances, k - 1, axis=1)[:, :k]
+            nearest_distances = np.take_along_axis(distances, nearest, axis=1)
+            order = np.argsort(nearest_distances, axis=1, kind="stable")
+            neighbours[queries] = candidates[np.take_along_axis(nearest, order, axis=1)]
+        return neighbours
+
+    def reset(self):
+        """Make every point available to nearest_remaining again."""
+        self.alive = (self.end - self.start).tolist()
+        self.removed[:] = False
+
+    def remove(self, point):
+        """Exclude point from nearest_remaining queries."""
+        self.removed[point] = True
+        node = int(self.leaf_of[point])
+        while node >= 0:
+            self.alive[node] -= 1
+            node = self.parent[node]
+
+    def nearest_remaining(self, point):
+        """Closest point that has not been removed, or -1 when none is left."""
+        target = self.points[point]
+        x, y = float(target[0]), float(target[1])
+        best, best_distance = -1, np.inf
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            if not self.alive[node] or self.box_distance(node, target, target) >= best_distance:
+                continue
+            if self.is_leaf[node]:
+                members = self.index[self.start[node]:self.end[node]]
+                members = members[~self.removed[members]]
+                distances = np.hypot(self.points[members, 0] - x, self.points[members, 1] - y)
+                closest = int(np.argmin(distances))
+                if distances[closest] < best_distance:
+                    best, best_distance = int(members[closest]), float(distances[closest])
+            else:
+                # Visit the nearer child first (it is pushed last)
+                left, right = self.left[node], self.right[node]
+                if self.box_distance(left, target, target) <= self.box_distance(right, target, target):
+                    stack.append(right)
+                    stack.append(left)
+                else:
+                    stack.append(left)
+                    stack.append(right)
+        return best
@@ -1,11 +1,32 @@
 import math
 import random
+import numpy as np
 import matplotlib.pyplot as plt
 import tsp_visualizer
+from kd_tree import KDTree
+
+# Instances up to matrix_limit cities get a full distance matrix (float32, or int32 rounded as
+# TSPLIB EUC_2D when rounded=True). Larger ones get K-nearest-neighbour candidate lists from a
+# KD-tree instead, and distances are computed from the coordinates when needed. The default
+# limit keeps the matrix at 16 MB (2000^2 4-byte entries), which covers every instance in Data/
+# (the largest has under 1000 cities); pass matrix_limit=0 to never build one.
+MATRIX_LIMIT = 2000
+CANDIDATES = 10
+
+def euclidean_matrix(coordinates, rounded=False):
+    coordinates = np.asarray(coordinates, dtype=np.float64)
+    matrix = np.empty((len(coordinates), len(coordinates)), dtype=np.int32 if rounded else np.float32)
+    # Row blocks keep the float64 temporaries small
+    for start in range(0, len(coordinates), 512):
+        block = coordinates[start:start + 512]
+        distances = np.hypot(block[:, None, 0] - coordinates[None, :, 0], block[:, None, 1] - coordinates[None, :, 1])
+        matrix[start:start + 512] = np.floor(distances + 0.5) if rounded else distances
+    return matrix
 
 class SimulatedAnnealing:
-    def __init__(self, coordinates, location_names, stopping_iter, total_nodes=-1, temp_init=-1, stop_temp=-1):
-        self.coordinates = coordinates
+    def __init__(self, coordinates, location_names, stopping_iter, total_nodes=-1, temp_init=-1, stop_temp=-1,
+                 rounded=False, matrix_limit=MATRIX_LIMIT, candidates=CANDIDATES):
+        self.coordinates = np.asarray(coordinates, dtype=np.float64)
         self.location_names = location_names
         self.num_locations = len(coordinates)
         self.stopping_temp = 1e-8
@@ -17,16 +38,33 @@ class SimulatedAnnealing:
         self.lowest_cost = float("Inf")
         self.cost_history = []
         self.route_history = []
+        self.rounded = rounded
+        self.distance_matrix = None
+        self.kd_tree = None
+        self.candidates = None
+        if self.num_locations <= matrix_limit:
+            self.distance_matrix = euclidean_matrix(self.coordinates, rounded)
+        else:
+            self.kd_tree = KDTree(self.coordinates)
+            self.candidates = self.kd_tree.k_nearest(candidates)
 
     def calculate_cost(self, path):
-        total_cost = 0
-        for i in range(self.num_locations):
-            total_cost += self.distance(path[i % self.num_locations], path[(i + 1) % self.num_locations])
-        return total_cost
+        path = np.asarray(path)
+        following = np.roll(path, -1)
+        if self.distance_matrix is not None:
+            return float(self.distance_matrix[path, following].sum(dtype=np.float64))
+        steps = self.coordinates[following] - self.coordinates[path]
+        distances = np.hypot(steps[:, 0], steps[:, 1])
+        if self.rounded:
+            distances = np.floor(distances + 0.5)
+        return float(distances.sum())
 
     def distance(self, location1, location2):
+        if self.distance_matrix is not None:
+            return float(self.distance_matrix[location1, location2])
         coord1, coord2 = self.coordinates[location1], self.coordinates[location2]
-        return math.sqrt((coord1[0] - coord2[0]) ** 2 + (coord1[1] - coord2[1]) ** 2)
+        distance = math.sqrt((coord1[0] - coord2[0]) ** 2 + (coord1[1] - coord2[1]) ** 2)
+        return float(math.floor(distance + 0.5)) if self.rounded else distance
 
     def evaluate_path(self, new_path):
         new_cost = self.calculate_cost(new_path)
@@ -39,16 +77,40 @@ class SimulatedAnnealing:
                 self.current_cost = new_cost
                 self.current_route = new_path
 
-    def initial_route(self):
-        current_loc = random.choice(self.node_sequence)
+    def nearest_neighbour_route(self, current_loc):
+        """Greedy tour from current_loc, always moving to the closest unvisited location."""
+        visited = np.zeros(self.num_locations, dtype=bool)
+        visited[current_loc] = True
         path = [current_loc]
-        remaining_locs = set(self.node_sequence)
-        remaining_locs.remove(current_loc)
-        while remaining_locs:
-            next_loc = min(remaining_locs, key=lambda x: self.distance(current_loc, x))
+        if self.distance_matrix is not None:
+            # Visited locations are masked with +inf in a float copy of the current row
+            for _ in range(self.num_locations - 1):
+                row = np.where(visited, np.inf, self.distance_matrix[current_loc])
+                current_loc = int(np.argmin(row))
+                visited[current_loc] = True
+                path.append(current_loc)
+            return path
+
+        # Candidate lists first; the KD-tree only when all K nearest are already visited
+        tree = self.kd_tree
+        tree.remove(current_loc)
+        candidates = self.candidates.tolist()
+        for _ in range(self.num_locations - 1):
+            for next_loc in candidates[current_loc]:
+                if not visited[next_loc]:
+                    break
+            else:
+                next_loc = tree.nearest_remaining(current_loc)
             current_loc = next_loc
-            remaining_locs.remove(current_loc)
+            visited[current_loc] = True
+            tree.remove(current_loc)
             path.append(current_loc)
+        tree.reset()
+        return path
+
+    def initial_route(self):
+        current_loc = random.choice(self.node_sequence)
+        path = self.nearest_neighbour_route(current_loc)
         initial_cost = self.calculate_cost(path)
         if self.lowest_cost > initial_cost:
             self.lowest_cost = initial_cost
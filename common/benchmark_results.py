@@ -0,0 +1,17 @@
+import csv
+import json
+
+# Result files shared by the benchmark scripts of the labs: a list of row dicts is written as
+# CSV when the path ends in .csv (columns in the order of fields, missing values left empty)
+# and as JSON otherwise.
+
+def write_results(results, path, fields):
+    if path.endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            for row in results:
+                writer.writerow(row)
+    else:
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
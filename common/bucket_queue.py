@@ -0,0 +1,64 @@
+class BucketQueue:
+    """Open list for A* when f and g are small non-negative integers.
+
+    Nodes live in parallel arrays (item, g, parent) and are referred to by integer ids, so a
+    search keeps one parent pointer per node instead of a copy of the path. Open nodes are
+    kept in buckets indexed by f and then by g: push is O(1), and pop takes the lowest f and,
+    among equal f, the largest g (the deepest node), newest first. This makes the order of
+    expansion deterministic without ever comparing states.
+    """
+
+    def __init__(self):
+        self.items = []
+        self.g = []
+        self.parent = []
+        self.buckets = []  # buckets[f][g] -> list of node ids
+        self.min_f = 0
+        self.size = 0
+        self.peak_size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, item, g, h, parent=None):
+        """Queue a node with cost g and heuristic h and return its id."""
+        node = len(self.items)
+        self.items.append(item)
+        self.g.append(g)
+        self.parent.append(parent)
+        f = g + h
+        while len(self.buckets) <= f:
+            self.buckets.append([])
+        bucket = self.buckets[f]
+        while len(bucket) <= g:
+            bucket.append([])
+        bucket[g].append(node)
+        if f < self.min_f:
+            self.min_f = f
+        self.size += 1
+        if self.size > self.peak_size:
+            self.peak_size = self.size
+        return node
+
+    def pop(self):
+        """Remove and return the id of the best open node."""
+        if self.size == 0:
+            raise IndexError("pop from an empty BucketQueue")
+        while True:
+            bucket = self.buckets[self.min_f]
+            while bucket and not bucket[-1]:
+                bucket.pop()
+            if bucket:
+                break
+            self.min_f += 1
+        self.size -= 1
+        return bucket[-1].pop()
+
+    def path(self, node):
+        """Items from the root to node, following parent pointers."""
+        items = []
+        while node is not None:
+            items.append(self.items[node])
+            node = self.parent[node]
+        items.reverse()
+        return items
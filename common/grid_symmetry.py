@@ -0,0 +1,37 @@
+# Board encoding and symmetry reduction shared by the list-of-lists Marble Solitaire searches of
+# Lab 3. Boards are square grids of 1 (marble), 0 (empty hole) and -1 (cell that is not a hole),
+# the same encoding marble_bitboard.py reads.
+# The eight rotations and reflections of the square grid map jumps onto jumps, so two positions
+# that are images of each other under one that keeps the target hole in place are equally far
+# from the goal. Visited sets store the smallest image of every board. symmetry_permutations
+# lists, for each such transform, the flat cell index read for every flat position.
+symmetry_cache = {}
+
+def symmetry_permutations(size, center):
+    key = (size, center)
+    if key not in symmetry_cache:
+        last = size - 1
+        transforms = [lambda i, j: (i, j), lambda i, j: (j, last - i), lambda i, j: (last - i, last - j),
+                      lambda i, j: (last - j, i), lambda i, j: (i, last - j), lambda i, j: (last - i, j),
+                      lambda i, j: (j, i), lambda i, j: (last - j, last - i)]
+        symmetry_cache[key] = [[t(i, j)[0] * size + t(i, j)[1] for i in range(size) for j in range(size)]
+                               for t in transforms if t(*center) == tuple(center)]
+    return symmetry_cache[key]
+
+def check_board(board, target):
+    """Raise ValueError unless board follows the encoding and target is one of its holes."""
+    for row in board:
+        for cell in row:
+            if cell not in (-1, 0, 1):
+                raise ValueError(f"board cell {cell!r} is not 1 (marble), 0 (hole) or -1 (no hole)")
+    if board[target[0]][target[1]] == -1:
+        raise ValueError(f"target {target} is not a hole of the board")
+
+def canonical_key(board, center):
+    """Smallest flattened image of a square board under the symmetries that fix center."""
+    size = len(board)
+    cells = [cell for row in board for cell in row]
+    if any(len(row) != size for row in board):
+        return tuple(cells)
+    return min(tuple(cells[k] for k in permutation)
+               for permutation in symmetry_permutations(size, center))